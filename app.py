@@ -1,10 +1,16 @@
+import os
+import tempfile
+from collections import deque
+
 import streamlit as st
-import matplotlib.pyplot as plt
-import matplotlib.image as mpimg
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-import numpy as np
+
+import plots
+from beamcalc import ContributionCache, PersistentCache, SolverCache, StageMetrics, StageTimer, cached_group, cached_solve, load_case_key, load_envelope, moving_load, normalize_distributed_loads
+
+run_timer = StageTimer()  # stage timings of this rerun, see the "Timing" expander
 
 st.set_page_config(layout="wide")  #Set layout to wide for side-by-side display
+plots.check_icons()  # fail at startup, not mid-render, if an icon is missing or unreadable
 st.title("Beam SFD and BMD Calculator")
 st.write("Better version is available (v2.0): https://beam-calculator.streamlit.app/")
 st.markdown(
@@ -22,7 +28,7 @@ with col1:
     # Input: Supports
     st.write('#### Define Supports') # The more the #, the font size will become smaller, and there must be a space after #
     support_types = ["Fixed", "Hinge", "Roller"]
-    num_supports = st.number_input('Number of Supports', min_value=1, max_value=2, value=1)
+    num_supports = st.number_input('Number of Supports', min_value=1, max_value=200, value=1)
     supports = []
     for i in range(int(num_supports)):
         col1_a, col1_b = st.columns(2)
@@ -37,6 +43,11 @@ with col1:
             supports.append((select_support_type, position))
     # st.write(supports)
 
+    # Load groups for factored combinations
+    envelope_mode = st.checkbox("Load combination envelope", help="Assign every load to a group and plot the max/min diagrams over factored combinations")
+    load_groups = ["Dead", "Live", "Wind"]
+    point_load_groups, distributed_load_groups, moment_groups = [], [], []
+
     # Input: Point Loads
     st.write("#### Define Point Loads")
     num_point_loads = st.number_input('Number of point loads', min_value=0, max_value=5, value=0)
@@ -47,6 +58,8 @@ with col1:
             position = st.number_input(f"Point Load {i+1} position (m from left):", min_value=0.0, max_value=beam_length, step=1.0, key=f"point_load_pos_{i}")
         with col1_d:
             magnitude = st.number_input(f'Point Load {i+1} magnitude (kN):', step=0.5, key=f"point_load_mag_{i}")
+            if envelope_mode:
+                point_load_groups.append(st.selectbox(f"Point Load {i+1} group:", load_groups, key=f"point_load_group_{i}"))
         point_loads.append((position, magnitude))
     # st.write(point_loads)
 
@@ -62,7 +75,11 @@ with col1:
         with col1_f:
             end_pos = st.number_input(f"Distributed Load {i+1} ending position (m from left):", min_value=0.0, max_value=beam_length, step=1.0, key=f"dist_load_end_{i}")
             end_mag = st.number_input(f"Distributed Load {i+1} end magnitude (kN/m):",value= start_mag, step=0.5, key=f"dist_load_end_mag_{i}")
+            if envelope_mode:
+                distributed_load_groups.append(st.selectbox(f"Distributed Load {i+1} group:", load_groups, key=f"dist_load_group_{i}"))
         distributed_loads.append((start_pos, end_pos, start_mag, end_mag))
+    # start and end are independent inputs, so a load may be entered right to left
+    distributed_loads = normalize_distributed_loads(distributed_loads)
     # st.write(distributed_loads)
 
     # Input: Moments
@@ -75,447 +92,239 @@ with col1:
             moment_position = st.number_input(f"Moment {i+1} position (m from left):", min_value=0.0, max_value=beam_length, step=1.0, key=f"moment_pos_{i}")
         with col1_h:
             moment_magnitude = st.number_input(f"Moment {i+1} magnitude (kNm)", step=1.0, key=f"moment_mag_{i}")
+            if envelope_mode:
+                moment_groups.append(st.selectbox(f"Moment {i+1} group:", load_groups, key=f"moment_group_{i}"))
         moments.append((moment_position,moment_magnitude))
     # st.write(moments)
 
+    # Input: Section
+    st.write("#### Define Section")
+    col1_i, col1_j = st.columns(2)
+    with col1_i:
+        elastic_modulus = st.number_input("Elastic modulus E (GPa)", min_value=0.1, value=200.0, step=10.0)
+    with col1_j:
+        second_moment = st.number_input("Moment of inertia I (x10^6 mm^4)", min_value=0.001, value=100.0, step=10.0)
+    flexural_rigidity = elastic_modulus * second_moment  # GPa * 10^6 mm^4 = kNm^2
+
+    # Input: Load Combinations
+    if envelope_mode:
+        st.write("#### Define Load Combinations")
+        combination_rows = st.data_editor(
+            [
+                {"Combination": "1.4D", "Dead": 1.4, "Live": 0.0, "Wind": 0.0},
+                {"Combination": "1.2D + 1.6L", "Dead": 1.2, "Live": 1.6, "Wind": 0.0},
+                {"Combination": "1.2D + 1.0L + 1.0W", "Dead": 1.2, "Live": 1.0, "Wind": 1.0},
+                {"Combination": "0.9D + 1.0W", "Dead": 0.9, "Live": 0.0, "Wind": 1.0},
+            ],
+            num_rows="dynamic",
+            key="load_combinations",
+        )
+        group_loads = {
+            group: (
+                [load for load, g in zip(point_loads, point_load_groups) if g == group],
+                [load for load, g in zip(distributed_loads, distributed_load_groups) if g == group],
+                [load for load, g in zip(moments, moment_groups) if g == group],
+            )
+            for group in load_groups
+        }
+        combinations = {}
+        for i, row in enumerate(combination_rows):
+            name = row["Combination"] or f"Combination {i+1}"
+            if name in combinations:
+                # a repeated name would silently replace the earlier row in the envelope
+                unique, copy = name, 1
+                while unique in combinations:
+                    copy += 1
+                    unique = f"{name} ({copy})"
+                st.warning(f"Combination name \"{name}\" is used more than once, row {i+1} is shown as \"{unique}\"")
+                name = unique
+            combinations[name] = {group: float(row[group] or 0.0) for group in load_groups}
 
-######## CALCULATION
-## Reactions
-def calculate_reactions(supports, point_loads, distributed_loads, moments, beam_length):
-    num_supports = len(supports)
-    if num_supports == 1:
-        for support_types, position in supports:
-            if support_types == "Fixed":
-                sum_point_loads = 0
-                sum_dist_loads = 0
-                sum_point_loads_moments = 0
-                sum_dist_loads_moments = 0
-                sum_external_moments = 0
-
-                fixed_support_pos = position
-
-                for position, magnitude in point_loads:
-                    sum_point_loads += magnitude
-                    sum_point_loads_moments += magnitude * abs(position - fixed_support_pos)
-
-                for start_pos, end_pos, start_mag, end_mag in distributed_loads:
-                    sum_dist_loads += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos))
-                    if end_mag+start_mag != 0 :
-                        centroid_left = ((abs(end_pos-start_pos))/3) * ((2*end_mag+start_mag)/(end_mag+start_mag))
-                        centroid_right = abs(start_pos - end_pos) - centroid_left
-                        distance_left = min(start_pos, end_pos)
-                        distance_right = beam_length - max(start_pos, end_pos)
-                        if fixed_support_pos == 0:
-                            sum_dist_loads_moments += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos)) * (centroid_left+distance_left)
-                        else:
-                            sum_dist_loads_moments += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos)) * (centroid_right+distance_right)
-                    # else:
-                    #     return False
-
-                for position, magnitude in moments:
-                    sum_external_moments += magnitude
-
-                reaction_1 = -sum_point_loads - sum_dist_loads
-                moment_1 = sum_point_loads_moments +sum_dist_loads_moments -sum_external_moments
-
-                reaction_moment = [reaction_1, moment_1]
-                reaction_moment_pos = []
-                for support_types, position in supports:
-                    reaction_moment_pos.append(position)
-                reactions = []
-                for i in reaction_moment:
-                    reactions.append((reaction_moment_pos[0],i))
-
-                return reactions
-            else:
-                return False
-    elif num_supports == 2:
-        if any(support_type == "Fixed" for support_type, position in supports):
-            return False
-        else:
-            sum_point_loads = 0
-            sum_dist_loads = 0
-            sum_point_loads_moments = 0
-            sum_dist_loads_moments = 0
-            sum_external_moments = 0
-
-            for position, magnitude in point_loads:
-                sum_point_loads += magnitude
-                sum_point_loads_moments += magnitude*(position)
-            for start_pos, end_pos, start_mag, end_mag in distributed_loads:
-                sum_dist_loads += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos))
-                if end_mag+start_mag != 0 :
-                    centroid_left = ((abs(end_pos-start_pos))/3) * ((2*end_mag+start_mag)/(end_mag+start_mag))
-                    distance_left = min(start_pos, end_pos)
-                    sum_dist_loads_moments += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos)) * (centroid_left+distance_left)
-                else:
-                    return False
-
-            for position, magnitude in moments:
-                sum_external_moments += magnitude
-            
-            # [(1,1), (support_1_pos, support_2_pos)]*[(r1, r2)] = [(sum_point_load+sum_dist_load), (sum_point_moment+sum_dist_moment+sum_external_moment)]
-            # format: Ax = B
-            # formula: x = np.linalg.solve(A, B) 
-
-            reaction_coefficient_mat = [(1,1)]
-            support_position = []
-            for support_type, position in supports:
-                support_position.append(position)
-            reaction_coefficient_mat.append(support_position)
-            # st.write(reaction_coefficient_mat)
-
-            constant_mat = [(sum_point_loads + sum_dist_loads), (sum_point_loads_moments + sum_dist_loads_moments - sum_external_moments)]
-            # st.write(constant_mat)
-
-            try:
-                r = np.linalg.solve(reaction_coefficient_mat, constant_mat)
-                r1, r2 = -r
-            except np.linalg.LinAlgError:
-                r1 = 0
-                r2 = 0
-
-        reaction_mag = [r1, r2]
-        reaction_pos = []
-        for support_types, position in supports:
-            reaction_pos.append(position)
-        reactions = []
-        for a, b in zip(reaction_pos, reaction_mag):
-            reactions.append((a,b))
-
-        return reactions
-    else:
-        return False
-
-
-def shear_force(support_reactions, point_loads, distributed_loads, beam_length, resolution):
-    shear = [0.0] * (int(beam_length * resolution) + 1) #define list for shear
-    x_coords = np.linspace(0, beam_length, len(shear))
-
-    # add support reactions to shear force
-    # st.write(type(support_reactions))
-    for position, magnitude in support_reactions:
-        for i, x in enumerate(x_coords):
-            if x >= position:
-                shear[i] +=magnitude
-    # add point load to the shear force
-    for position, magnitude in point_loads:
-        for i, x in enumerate(x_coords):
-            if x>= position:
-                shear[i] += magnitude
-    for start_pos, end_pos, start_mag, end_mag in distributed_loads:
-        for i, x in enumerate(x_coords):
-            if start_pos <= x <= end_pos:
-                # Calculate the load at position x
-                load = start_mag + (end_mag - start_mag) * ((x - start_pos) / (end_pos - start_pos))
-                # Incremental load based on segment size
-                increment = load * (x_coords[1] - x_coords[0])
-                # Update shear for all positions y >= x
-                for j, y in enumerate(x_coords):
-                    if y >= x:
-                        shear[j] += increment  #  load increment  # Apply and accumulate the load
-                        # st.write(f"x: {x}, Load: {load:.2f}, Increment: {increment:.2f}, Updated Shear: {shear[i]:.2f}")
-    return x_coords, shear
-
-def bending_moment(supports, support_reactions, support_moments, point_loads, distributed_loads, external_moments, beam_length, resolution):
-    bending_moment = [0.0] * (int(beam_length * resolution) + 1)
-    x_coords = np.linspace(0, beam_length, len(bending_moment))
-
-    #fixed support postion
-    for support_types, position in supports:
-        if support_types == "Fixed":
-            fixed_support_pos = position
-
-    # add support reaction moment to bending moment
-    for position, magnitude in support_reactions:
-        for i, x in enumerate(x_coords):
-            if x >= position:
-                bending_moment[i] += magnitude * (x-position)
-
-    # add support moments to bending moment
-    if support_moments:
-        for position, magnitude in support_moments:
-            for i, x in enumerate(x_coords):
-                if x >= position:
-                    if fixed_support_pos == 0:
-                        bending_moment[i] += magnitude
-                    else:
-                        bending_moment[i] -= magnitude
-    
-    # add point load to the bending moment
-    for position, magnitude in point_loads:
-        for i, x in enumerate(x_coords):
-            if x>=position:
-                bending_moment[i] += magnitude * (x-position)
-    
-    # add distributed loads to the bending monet
-    for start_pos, end_pos, start_mag, end_mag in distributed_loads:
-        for i, x in enumerate(x_coords):
-            if start_pos <= x <= end_pos:
-                # Calculate the load at position x using linear interpolation
-                load = start_mag + (end_mag - start_mag) * ((x - start_pos) / (end_pos - start_pos))
-
-                # Incremental load based on the segment size
-                increment = load * (x_coords[1] - x_coords[0])
-
-                # Update bending moment for all positions y >= x (similar to shear force approach)
-                for j, y in enumerate(x_coords):
-                    if y >= x:
-                        bending_moment[j] += (y - x) * increment
-    
-    # add external moments
-    for position, magnitude in external_moments:
-        for i, x in enumerate(x_coords):
-            if x >= position:
-                bending_moment[i] += magnitude
 
-    return x_coords, bending_moment
+######## CALCULATION
+run_timer.lap("inputs")
+
+@st.cache_resource
+def get_solver_cache():
+    # one cache per server process, shared by every session. With BEAMCALC_CACHE_DIR set,
+    # solutions are also kept on disk there, shared by every process and kept across restarts.
+    cache_dir = os.environ.get("BEAMCALC_CACHE_DIR")
+    backing = None
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        backing = PersistentCache(os.path.join(cache_dir, "solutions.sqlite"), max_bytes=int(os.environ.get("BEAMCALC_CACHE_MB", 256)) * 2**20)
+    return SolverCache(maxsize=256, backing=backing)
+
+@st.cache_resource
+def get_figure_cache():
+    # encoded diagrams, shared by every session like the solver cache
+    return plots.FigureCache(maxbytes=64 * 2**20)
+
+@st.cache_resource
+def get_render_executor():
+    # Figures are drawn concurrently and shown in order, on threads by default.
+    # BEAMCALC_RENDER_MODE=processes renders in forked worker processes for real
+    # parallelism on multi-core servers, serial draws them inline.
+    mode = os.environ.get("BEAMCALC_RENDER_MODE", "threads")
+    return plots.render_executor(mode, workers=int(os.environ.get("BEAMCALC_RENDER_WORKERS", 4)))
+
+def submit_figure(kind, model_key, plot, *args):
+    # start drawing plot(*args) now (or take it from the figure cache); show it with show_figure
+    return get_figure_cache().submit(plots.figure_key(kind, model_key), get_render_executor(), plot, *args)
+
+def show_figure(kind, figure):
+    # the stage is the time spent waiting for this figure after the earlier ones were shown
+    with run_timer.stage(f"figure: {kind}"):
+        image = figure.result()
+    st.image(image, width="stretch")
+
+@st.cache_resource
+def get_stage_metrics():
+    # rolling p50/p95/p99 per stage over all sessions, also exported for scraping
+    path = os.environ.get("BEAMCALC_METRICS_FILE", os.path.join(tempfile.gettempdir(), "beamcalc_stages.prom"))
+    return StageMetrics(window=1000, path=path)
+
+@st.cache_resource
+def get_memory_log():
+    # figure count and RSS after every rerun, newest last, for watching long-running servers
+    return deque(maxlen=2000)
+
+def support_label(i):
+    # A, B, C, ... then numbers once the alphabet runs out
+    return chr(ord("A") + i) if i < 26 else str(i + 1)
 
 with col2:
 
+    # the sketch only needs the inputs, so it is drawn while the beam is solved
+    beam_figure = submit_figure("beam", load_case_key(supports, point_loads, distributed_loads, moments, beam_length), plots.plot_beam, supports, point_loads, distributed_loads, moments, beam_length)
+
     col2_a, col2_b = st.columns(2)
+    with col2_b:
+        # Input for the number of points on each diagram
+        max_points = st.number_input("Diagram points (higher = smoother curves)", min_value=50, max_value=5000, value=400, step=50)
     with col2_a:
         ## RESULTS
         # Reactions and Moments
-        support_reactions_moments = calculate_reactions(supports, point_loads, distributed_loads, moments, beam_length)
-        if support_reactions_moments == False:
+        solver_cache = get_solver_cache()
+        model_key = load_case_key(supports, point_loads, distributed_loads, moments, beam_length, int(max_points), flexural_rigidity)
+        with run_timer.stage("solve"):
+            # per-session load contributions, so editing one load only recomputes that load
+            contributions = st.session_state.setdefault("load_contributions", ContributionCache())
+            solution = cached_solve(solver_cache, supports, point_loads, distributed_loads, moments, beam_length, max_points, flexural_rigidity, contributions)
+        if solution is None:
             st.warning("Can't Solve")
         else:
-            if num_supports == 1:
-                support_reactions, support_moments = calculate_reactions(supports, point_loads, distributed_loads, moments, beam_length)
-                support_reactions = [support_reactions]
-                support_moments = [support_moments]
-                # support_reactions = list(support_reactions_moments[0]) #(a,b)
-                # support_moments = list(support_reactions_moments[1])  #(a,b)
-                # st.write(support_reactions)
-                # st.write(f"Reaction at support A: **{round(reactions[2],2)} kN**")
-                # st.write(f"Moment at support A: **{round(reactions[6],2)} kNm**")
-                st.write("Reaction at support A: ", round(support_reactions[0][1],2), " kN")
-                st.write("Moment at support A: ", round(support_moments[0][1],2), " kNm")
-            elif num_supports == 2:
-                support_reactions = calculate_reactions(supports, point_loads, distributed_loads, moments, beam_length)
-                support_moments = []
-                # st.write(support_reactions) #[[a,b], [c,d]]
-                Ra = support_reactions[0][1]
-                Rb = support_reactions[1][1]
-                # st.write(f"Reaction at support A: **{round(reactions[0],2)} kN**")
-                # st.write(f"Reaction at support B: **{round(reactions[1],2)} kN**")
-                st.write("Reaction at support A: ", round(Ra,2), " kN")
-                st.write("Reaction at support B: ", round(Rb,2), " kN")
-    with col2_b:
-        # Input for resolution
-        resolution = st.number_input("Resolution (higher = more precision)", min_value=10, max_value=1000, value=100, step=10)
+            # the diagrams are independent of each other once the beam is solved
+            diagram_figures = {"shear": submit_figure("shear", model_key, plots.plot_shear, solution), "moment": submit_figure("moment", model_key, plots.plot_moment, solution)}
+            if solution.deflection is not None:
+                diagram_figures["deflection"] = submit_figure("deflection", model_key, plots.plot_deflection, solution)
+            for i, (position, magnitude) in enumerate(solution.reactions):
+                st.write(f"Reaction at support {support_label(i)}: ", round(magnitude,2), " kN")
+            # support_moments has one entry per fixed support, in the order of the supports
+            fixed_supports = [i for i, (support_type, position) in enumerate(supports) if support_type == "Fixed"]
+            for i, (position, magnitude) in zip(fixed_supports, solution.support_moments):
+                st.write(f"Moment at support {support_label(i)}: ", round(magnitude,2), " kNm")
     
     st.write('Upward Load +ve & Clockwise Moment +ve')
 
     # Figure
-    # Display the beam with supports, loads and moments
-    fig, ax = plt.subplots(figsize=(12, 4))
-    ax.plot([0, beam_length], [0,0], 'b-', lw=20)
-
-    ax.set_xlim(-beam_length * 0.1, beam_length * 1.1)
-    ax.set_ylim(-1, 1)
-    ax.get_yaxis().set_visible(False) # Hide y-axis
-
-    ##Support
-    # Load icons for each support type
-    fixed_left_icon_path = 'icons/fixed_support_left.png'
-    fixed_right_icon_path = 'icons/fixed_support_right.png'
-    hinge_icon_path = 'icons/hinge_support.png'
-    roller_icon_path = 'icons/roller_support.png'
-
-    # Load the images using the correct path
-    hinge_icon = mpimg.imread(hinge_icon_path)
-    fixed_icon_left = mpimg.imread(fixed_left_icon_path)
-    fixed_icon_right = mpimg.imread(fixed_right_icon_path)
-    roller_icon = mpimg.imread(roller_icon_path)
-
-    for support_type, position in supports:
-        if support_type == "Fixed":
-            # Use the fixed support icon
-            if position == beam_length:
-                imagebox = OffsetImage(fixed_icon_right, zoom=0.5)
-            else:
-                imagebox = OffsetImage(fixed_icon_left, zoom=0.5)
-            ab = AnnotationBbox(imagebox, (position, 0), frameon=False)
-            ax.add_artist(ab)
-        elif support_type == "Hinge":
-            # Use the hinge support icon
-            imagebox = OffsetImage(hinge_icon, zoom=0.3)
-            ab = AnnotationBbox(imagebox, (position, -.14), frameon=False)
-            ax.add_artist(ab)
-        elif support_type == "Roller":
-            # Use the roller support icon
-            imagebox = OffsetImage(roller_icon, zoom=0.3)
-            ab = AnnotationBbox(imagebox, (position, -.14), frameon=False)
-            ax.add_artist(ab)
-
-    ##Point Load
-    max_magnitude = max((abs(mag) for _, mag in point_loads), default=0) # Find the maximum magnitude
-    # st.write(max_magnitude)
-    # Loop through point loads to draw arrows with adjusted positions and directions
-    for position, magnitude in point_loads:
-        if max_magnitude == 0:
-            continue
-        # Calculate arrow length based on magnitude, scaled to fit within the y-limits
-        direction = 1 if magnitude > 0 else (-1 if magnitude < 0 else 0)  # Downward if positive, upward if negative
-
-        if direction == 0:
-            continue
-
-        # Determine the starting y-coordinate based on load direction and beam thickness
-        start_y = -.22 * direction if magnitude > 0 else -.22 * direction
-
-        # Draw the arrow with the adjusted y-coordinate and length based on the load's sign and magnitude
-        ax.arrow(
-            position,              # x-coordinate of arrow's starting point
-            start_y,               # y-coordinate of arrow's starting point
-            0,                     # No horizontal movement, vertical arrow
-            direction * .01,  # Adjust length by direction and scaled magnitude
-            head_width=0.2,        # Width of the arrow head
-            head_length=0.1,       # Length of the arrow head
-            fc='red',              # Fill color of arrow
-            ec='red'               # Edge color of arrow
+    show_figure("beam", beam_figure)
+
+    if solution is not None:
+        # SFD
+        show_figure("shear", diagram_figures["shear"])
+        st.write(f"Maximum shear force: {round(solution.max_shear[1],2)} kN at {round(solution.max_shear[0],2)} m, minimum: {round(solution.min_shear[1],2)} kN at {round(solution.min_shear[0],2)} m")
+
+        # BMD
+        show_figure("moment", diagram_figures["moment"])
+        st.write(f"Maximum bending moment: {round(solution.max_moment[1],2)} kNm at {round(solution.max_moment[0],2)} m, minimum: {round(solution.min_moment[1],2)} kNm at {round(solution.min_moment[0],2)} m")
+
+        # Slope and deflection
+        if solution.deflection is not None:
+            show_figure("deflection", diagram_figures["deflection"])
+            st.write(f"Maximum deflection: {round(solution.max_deflection[1]*1000,2)} mm at {round(solution.max_deflection[0],2)} m, minimum: {round(solution.min_deflection[1]*1000,2)} mm at {round(solution.min_deflection[0],2)} m")
+
+        # The plots are thinned for drawing; the download has every computed point
+        st.download_button("Download diagram data (CSV)", solution.to_csv(), file_name="beam_diagrams.csv", mime="text/csv")
+
+    if envelope_mode:
+        # Load combination envelope
+        st.write("#### Load Combination Envelope")
+        with run_timer.stage("envelope"):
+            group_solutions = {group: cached_group(solver_cache, supports, *group_loads[group], beam_length) for group in load_groups}
+            envelope = load_envelope(group_solutions, combinations, max_points)
+        if envelope is None:
+            st.warning("Can't Solve")
+        else:
+            for i in range(envelope.reactions.shape[1]):
+                st.write(f"Reaction at support {support_label(i)}: ", round(envelope.reactions[:, i].max(),2), " kN (max), ", round(envelope.reactions[:, i].min(),2), " kN (min)")
+            envelope_key = ([load_case_key(supports, *group_loads[group], beam_length) for group in load_groups], sorted(combinations.items()), int(max_points))
+            envelope_figures = [submit_figure(f"{kind} envelope", envelope_key, plots.plot_envelope, envelope, kind) for kind in ("shear", "moment")]
+            show_figure("shear envelope", envelope_figures[0])
+            show_figure("moment envelope", envelope_figures[1])
+
+    # Moving load
+    if st.checkbox("Moving load analysis (influence lines)"):
+        st.write("#### Axle Train")
+        axle_rows = st.data_editor(
+            [
+                {"Axle load (kN)": 35.0, "Distance behind front axle (m)": 0.0},
+                {"Axle load (kN)": 145.0, "Distance behind front axle (m)": 4.3},
+                {"Axle load (kN)": 145.0, "Distance behind front axle (m)": 8.6},
+            ],
+            num_rows="dynamic",
+            key="axle_train",
         )
-        # Calculate the line length proportionally based on the max magnitude
-        line_length = direction * max(0.3, (abs(magnitude) / max_magnitude) * 0.8)
-        # st.write(line_length)
-
-        # Draw the red line from the arrowhead
-        ax.plot([position, position], [start_y, -line_length], 'r-', lw=1.5)
-        
-        point_loads_text = -line_length - 0.10 if magnitude > 0 else -line_length + 0.05
-        ax.text(position, point_loads_text, f'{abs(magnitude)} kN', color='red', ha='center')
-
-
-
-    ## Distributed Load
-    max_dist_magnitude = max((abs(mag) for _, _, mag1, mag2 in distributed_loads for mag in [mag1, mag2]), default=0)
-    # st.write(max_dist_magnitude)
-
-    for start_pos, end_pos, start_mag, end_mag in distributed_loads:
-        if max_dist_magnitude == 0:
-            continue
-
-        # Calculate directions based on magnitude signs
-        start_direction = 1 if start_mag > 0 else (-1 if start_mag < 0 else 0)
-        end_direction = 1 if end_mag > 0 else (-1 if end_mag < 0 else 0)
-
-        # Determine starting y-coordinates
-        start_y = -0.22 * start_direction if start_direction != 0 else 0
-        end_y = -0.22 * end_direction if end_direction != 0 else 0
-
-        # Calculate line lengths proportionally based on max magnitude
-        start_line_length = start_direction * max(0.3, (abs(start_mag) / max_dist_magnitude) * 0.8) if start_direction != 0 else 0
-        end_line_length = end_direction * max(0.3, (abs(end_mag) / max_dist_magnitude) * 0.8) if end_direction != 0 else 0
-
-        # Draw arrows at the start and end positions if direction is non-zero
-        if start_direction != 0:
-            ax.arrow(
-                start_pos,
-                start_y,
-                0,
-                start_direction * 0.01,
-                head_width=0.2,
-                head_length=0.1,
-                fc='green',
-                ec='green'
-            )
-        if end_direction != 0:
-            ax.arrow(
-                end_pos,
-                end_y,
-                0,
-                end_direction * 0.01,
-                head_width=0.2,
-                head_length=0.1,
-                fc='green',
-                ec='green'
-            )
-
-        # Draw the green lines from the arrowheads or connect the fill directly to y=0
-        ax.plot([start_pos, start_pos], [start_y, -start_line_length], 'g-', lw=1.5)
-        ax.plot([end_pos, end_pos], [end_y, -end_line_length], 'g-', lw=1.5)
-
-        # Connect the ends of the arrows and fill the area between
-        x_coords = [start_pos, start_pos, end_pos, end_pos]
-        y_coords = [-start_line_length if start_direction != 0 else 0, 0, 0, -end_line_length if end_direction != 0 else 0]
-        ax.fill(x_coords, y_coords, color='green', alpha=0.3)
-
-        # Label distributed load magnitudes at the start and end positions if direction is non-zero
-        if start_direction != 0:
-            start_pos_text = -start_line_length - 0.10 if start_mag > 0 else -start_line_length + 0.03
-            ax.text(
-                start_pos,
-                start_pos_text,
-                f'{abs(start_mag)} kN/m',
-                color='green',
-                ha='center'
-            )
-        if end_direction != 0:
-            end_pos_text = -end_line_length - 0.10 if end_mag > 0 else -end_line_length + 0.03
-            ax.text(
-                end_pos,
-                end_pos_text,
-                f'{abs(end_mag)} kN/m',
-                color='green',
-                ha='center'
-            )
-
-    ## Moment
-    clockwise_moment_icon_path = 'icons/moment_clockwise.png'
-    anticlockwise_moment_icon_path = 'icons/moment_anticlockwise.png'
-
-    clockwise_moment_icon = mpimg.imread(clockwise_moment_icon_path)
-    anticlockwise_moment_icon = mpimg.imread(anticlockwise_moment_icon_path)
-
-    for moment_position, moment_magnitude in moments:
-        if moment_magnitude > 0:
-            imagebox = OffsetImage(clockwise_moment_icon, zoom=0.13)
-            ab = AnnotationBbox(imagebox, (moment_position, 0.0), frameon=False)
-            ax.add_artist(ab)
-
-            ax.text(moment_position, 0.3, f'{abs(moment_magnitude)} kNm', color='black', ha='center')
-
-        elif moment_magnitude < 0:
-            imagebox = OffsetImage(anticlockwise_moment_icon, zoom=0.13)
-            ab = AnnotationBbox(imagebox, (moment_position, 0), frameon=False)
-            ax.add_artist(ab)
-
-            ax.text(moment_position, 0.3, f'{abs(moment_magnitude)} kNm', color='black', ha='center')
-
-    st.pyplot(fig)
-    plt.show()
-
-
-    # SFD  
-    x_coords, shear =shear_force(support_reactions, point_loads, distributed_loads, beam_length, resolution)
-    
-    # st.subheader("Shear Force Diagram")
-    fig, ax = plt.subplots(figsize=(12,4))
-    ax.plot(x_coords, shear, color ="blue")
-    ax.fill_between(x_coords, shear, 0, color="blue", alpha=0.3)
-    ax.axhline(0, color="black", linewidth=0.8, linestyle="--")
-    ax.set_title("Shear Force Diagram")
-    ax.set_xlabel("Beam Length (m)")
-    ax.set_ylabel("Shear Force (kN)")
-    # ax.legend()
-    st.pyplot(fig)
-    plt.show()
-
-    # BMD
-    x_coords, bending_moment = bending_moment(supports, support_reactions, support_moments, point_loads, distributed_loads, moments, beam_length, resolution)
-    
-    fig, ax = plt.subplots(figsize=(12,4))
-    ax.plot(x_coords, bending_moment, color ="green")
-    ax.fill_between(x_coords, bending_moment, 0, color="green", alpha=0.3)
-    ax.axhline(0, color="black", linewidth=0.8, linestyle="--")
-    ax.set_title("Bending Force Diagram")
-    ax.set_xlabel("Beam Length (m)")
-    ax.set_ylabel("Bending Moment (kNm)")
-    # ax.legend()
-    st.pyplot(fig)
-    plt.show()
+        influence_points = st.number_input("Influence line points", min_value=51, max_value=1001, value=201, step=50)
+        axles = [(row["Axle load (kN)"] or 0.0, row["Distance behind front axle (m)"] or 0.0) for row in axle_rows]
+        try:
+            with run_timer.stage("moving load"):
+                result = moving_load(supports, beam_length, [load for load, offset in axles], [offset for load, offset in axles], influence_points) if axles else None
+        except ValueError:
+            result = None
+        if result is None:
+            st.warning("Moving load analysis needs a cantilever (one fixed support) or two hinge/roller supports and at least one axle")
+        else:
+            value, section, front = result.max_moment
+            st.write(f"Absolute maximum bending moment: {round(value,2)} kNm at {round(section,2)} m (front axle at {round(front,2)} m)")
+            value, section, front = result.max_shear
+            st.write(f"Absolute maximum shear force: {round(value,2)} kN at {round(section,2)} m (front axle at {round(front,2)} m)")
+            for i, (value, front) in enumerate(result.max_reactions):
+                st.write(f"Maximum reaction at support {support_label(i)}: {round(value,2)} kN (front axle at {round(front,2)} m)")
+            show_figure("moving load", submit_figure("moving load", (load_case_key(supports, [], [], [], beam_length), axles, int(influence_points)), plots.plot_moving_load, result))
+
+    with st.expander("Caches"):
+        cache_stats = solver_cache.stats()
+        st.write(f"{cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['size']} of {cache_stats['maxsize']} entries used")
+        if solver_cache.backing is not None:
+            disk_stats = solver_cache.backing.stats()
+            st.write(f"On disk: {disk_stats['hits']} hits, {disk_stats['misses']} misses, {disk_stats['size']} solutions, {(disk_stats['nbytes'] or 0) / 2**20:.1f} of {disk_stats['max_bytes'] / 2**20:.0f} MB used")
+        contribution_stats = contributions.stats()
+        st.write(f"Load contributions (this session): {contribution_stats['reused']} reused, {contribution_stats['computed']} computed")
+        figure_stats = get_figure_cache().stats()
+        st.write(f"Figures: {figure_stats['hits']} hits, {figure_stats['misses']} misses, {figure_stats['size']} images, {figure_stats['nbytes'] / 2**20:.1f} of {figure_stats['maxbytes'] / 2**20:.0f} MB used")
+
+    memory_log = get_memory_log()
+    memory_log.append(plots.memory_sample(get_render_executor()))
+    with st.expander("Memory"):
+        samples = list(memory_log)  # other sessions append concurrently
+        latest = samples[-1]
+        st.write(f"{latest['figures']} live figures ({latest['pyplot_figures']} held by pyplot), {latest['rss_mb']} MB resident")
+        if latest["workers"]:
+            st.write(f"{latest['workers']} render worker processes, {latest['workers_rss_mb']} MB resident together")
+        st.line_chart({"Resident memory (MB)": [sample["rss_mb"] + sample["workers_rss_mb"] for sample in samples]})
+        st.line_chart({"Live figures": [sample["figures"] for sample in samples]})
+
+    run_timer.stages["total"] = run_timer.total()
+    stage_metrics = get_stage_metrics()
+    stage_metrics.record(run_timer.stages)
+    with st.expander("Timing (debug)"):
+        st.write(f"This rerun took {run_timer.stages['total'] * 1000:.1f} ms. Percentiles over recent reruns are also written to `{stage_metrics.path}`.")
+        summary = stage_metrics.summary()
+        st.dataframe([
+            {"Stage": name, "This rerun (ms)": round(seconds * 1000, 2), **{f"{p} (ms)": round(summary[name][p] * 1000, 2) for p in ("p50", "p95", "p99")}, "Runs": summary[name]["count"]}
+            for name, seconds in run_timer.stages.items()
+        ], hide_index=True)
     
 
 # My Introduction
@@ -0,0 +1,55 @@
+"""Beam analysis engine: reactions, SFD/BMD, slope and deflection.
+
+Only depends on NumPy, so it can be imported by the Streamlit page, batch jobs, worker
+processes, tests and notebooks alike.
+"""
+from .batch import solve_batch
+from .bulk import parse_beam, run_bulk
+from .cache import SolverCache, canonical_load_case, load_case_key
+from .combinations import LoadEnvelope, cached_group, load_envelope, solve_group
+from .diagrams import bending_moment, normalize_distributed_loads, shear_force
+from .exact import ContributionCache, deflection_diagrams, exact_diagrams, solve_exact
+from .influence import MovingLoadResult, influence_lines, moving_load
+from .metrics import StageMetrics, StageTimer
+from .persistent import PersistentCache
+from .piecewise import PiecewisePolynomial
+from .reactions import calculate_reactions, solve_reactions, split_reactions
+from .sampling import adaptive_samples
+from .solution import BeamSolution, cached_solve, solve_beam
+from .stiffness import solve_banded, solve_stiffness
+
+__all__ = [
+    "BeamSolution",
+    "ContributionCache",
+    "LoadEnvelope",
+    "MovingLoadResult",
+    "PersistentCache",
+    "PiecewisePolynomial",
+    "SolverCache",
+    "StageMetrics",
+    "StageTimer",
+    "adaptive_samples",
+    "bending_moment",
+    "cached_group",
+    "cached_solve",
+    "calculate_reactions",
+    "canonical_load_case",
+    "deflection_diagrams",
+    "exact_diagrams",
+    "influence_lines",
+    "load_case_key",
+    "load_envelope",
+    "moving_load",
+    "normalize_distributed_loads",
+    "parse_beam",
+    "run_bulk",
+    "shear_force",
+    "solve_banded",
+    "solve_batch",
+    "solve_beam",
+    "solve_exact",
+    "solve_group",
+    "solve_reactions",
+    "solve_stiffness",
+    "split_reactions",
+]
@@ -0,0 +1,23 @@
+"""Command-line entry point: ``python -m beamcalc <command> ...``."""
+import sys
+
+from . import bulk, server, worker
+
+
+COMMANDS = {
+    "bulk": bulk.main,
+    "serve": server.main,
+    "worker": worker.main,
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print(f"usage: python -m beamcalc {{{','.join(COMMANDS)}}} ...", file=sys.stderr)
+        return 2
+    return COMMANDS[argv[0]](argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
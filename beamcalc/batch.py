@@ -0,0 +1,93 @@
+"""Vectorized solver for many load cases on the same beam."""
+import numpy as np
+
+
+def _batch_array(loads, cases, fields):
+    if loads is None:
+        return np.zeros((cases, 0, fields))
+    loads = np.asarray(loads, dtype=float)
+    return loads.reshape(loads.shape[0], -1, fields)
+
+
+def _macaulay(x_coords, positions, power, left=None):
+    # <x - position>^power for every case, load and grid point: (cases, n, points). Where
+    # `left` is set the point is a limit from the left, without the terms that start there.
+    offset = x_coords[None, None, :] - positions[:, :, None]
+    inside = offset >= 0 if left is None else (offset > 0) | ((offset == 0) & ~left[None, None, :])
+    return np.where(inside, offset ** power, 0.0)
+
+
+def _load_sum(coefficients, x_coords, positions, power, left=None):
+    return np.sum(coefficients[:, :, None] * _macaulay(x_coords, positions, power, left), axis=1)
+
+
+# Many variants of the same beam (same supports and length, different load magnitudes and
+# positions) solved in one go. Loads come as arrays with one row per case:
+#   point_loads (cases, n, 2) [position, magnitude], distributed_loads (cases, n, 4)
+#   [start_pos, end_pos, start_mag, end_mag], moments (cases, n, 2) [position, magnitude]
+# Unused slots can be padded with zero magnitudes. `left` (booleans, one per x) marks the
+# points evaluated as limits from the left, i.e. just before a reaction or load acting there.
+def solve_batch(supports, beam_length, point_loads=None, distributed_loads=None, moments=None, resolution=100, x_coords=None, left=None):
+    given = [np.shape(loads)[0] for loads in (point_loads, distributed_loads, moments) if loads is not None]
+    if not given:
+        raise ValueError("solve_batch needs at least one of point_loads, distributed_loads or moments")
+    cases = given[0]
+    point_loads = _batch_array(point_loads, cases, 2)
+    distributed_loads = _batch_array(distributed_loads, cases, 4)
+    moments = _batch_array(moments, cases, 2)
+
+    point_pos, point_mag = point_loads[:, :, 0], point_loads[:, :, 1]
+    start_pos, end_pos, start_mag, end_mag = np.moveaxis(distributed_loads, 2, 0)
+    moment_pos, moment_mag = moments[:, :, 0], moments[:, :, 1]
+
+    # distributed loads running backwards have no extent on the grid, as in shear_force
+    valid = end_pos > start_pos
+    span = np.where(valid, end_pos - start_pos, 0.0)
+    slope = np.where(valid, (end_mag - start_mag) / np.where(valid, span, 1.0), 0.0)
+    start_mag, end_mag = np.where(valid, start_mag, 0.0), np.where(valid, end_mag, 0.0)
+
+    sum_point_loads = point_mag.sum(axis=1)
+    sum_dist_loads = (0.5 * (start_mag + end_mag) * span).sum(axis=1)
+    sum_external_moments = moment_mag.sum(axis=1)
+    # first moments about x = 0 (the trapezoid integral of w(x) * x)
+    sum_point_loads_moments = (point_mag * point_pos).sum(axis=1)
+    sum_dist_loads_moments = (span / 6 * (start_mag * (2 * start_pos + end_pos) + end_mag * (start_pos + 2 * end_pos))).sum(axis=1)
+
+    support_pos = np.array([position for support_type, position in supports], dtype=float)
+    if len(supports) == 1 and supports[0][0] == "Fixed":
+        fixed_support_pos = support_pos[0]
+        reactions = -(sum_point_loads + sum_dist_loads)[:, None]
+        if fixed_support_pos == 0:
+            dist_moment = sum_dist_loads_moments
+        else:
+            dist_moment = beam_length * sum_dist_loads - sum_dist_loads_moments
+        # as in calculate_reactions, applied couples enter a fixed right end's moment with the opposite sign
+        couple_sign = -1.0 if fixed_support_pos == 0 else 1.0
+        support_moments = ((point_mag * np.abs(point_pos - fixed_support_pos)).sum(axis=1) + dist_moment + couple_sign * sum_external_moments)[:, None]
+        couples = support_moments if fixed_support_pos == 0 else -support_moments
+    elif len(supports) == 2 and not any(support_type == "Fixed" for support_type, position in supports):
+        reaction_coefficient_mat = np.array([[1.0, 1.0], support_pos])
+        constant_mat = np.stack([sum_point_loads + sum_dist_loads, sum_point_loads_moments + sum_dist_loads_moments - sum_external_moments])
+        try:
+            reactions = -np.linalg.solve(reaction_coefficient_mat, constant_mat).T
+        except np.linalg.LinAlgError:
+            reactions = np.zeros((cases, 2))
+        support_moments = np.zeros((cases, 0))
+        couples = support_moments
+    else:
+        raise ValueError("solve_batch handles one fixed support or two hinge/roller supports")
+
+    if x_coords is None:
+        x_coords = np.linspace(0, beam_length, int(beam_length * resolution) + 1)
+    support_positions = np.broadcast_to(support_pos, (cases, len(supports)))
+
+    shear = _load_sum(reactions, x_coords, support_positions, 0, left) + _load_sum(point_mag, x_coords, point_pos, 0, left)
+    shear += _load_sum(start_mag, x_coords, start_pos, 1, left) + _load_sum(slope / 2, x_coords, start_pos, 2, left)
+    shear -= _load_sum(end_mag, x_coords, end_pos, 1, left) + _load_sum(slope / 2, x_coords, end_pos, 2, left)
+
+    moment = _load_sum(reactions, x_coords, support_positions, 1, left) + _load_sum(point_mag, x_coords, point_pos, 1, left)
+    moment += _load_sum(couples, x_coords, support_positions[:, :couples.shape[1]], 0, left) + _load_sum(moment_mag, x_coords, moment_pos, 0, left)
+    moment += _load_sum(start_mag / 2, x_coords, start_pos, 2, left) + _load_sum(slope / 6, x_coords, start_pos, 3, left)
+    moment -= _load_sum(end_mag / 2, x_coords, end_pos, 2, left) + _load_sum(slope / 6, x_coords, end_pos, 3, left)
+
+    return x_coords, reactions, support_moments, shear, moment
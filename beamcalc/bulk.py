@@ -0,0 +1,233 @@
+"""Streaming analysis of beam definitions stored in CSV or Parquet files.
+
+    python -m beamcalc bulk beams.csv results.csv [--chunk-size 256] [--diagram-points 200]
+
+One beam per row. Columns: ``id`` (optional), ``length``, ``supports``, ``point_loads``,
+``distributed_loads``, ``moments`` and optionally ``flexural_rigidity`` (EI in kNm^2, adds
+deflections). Load columns hold items separated by ``;`` with fields separated by ``:``,
+in the page's units and sign convention, or a JSON list (Parquet list columns work too):
+
+    supports            Hinge:0;Roller:10           type:position
+    point_loads         3:-5;7:-10                  position:magnitude
+    distributed_loads   0:10:-2:-2                  start:end:start magnitude:end magnitude
+    moments             5:20                        position:magnitude
+
+Rows are read, solved and written one chunk at a time, so memory does not grow with the
+size of the input. Parquet needs pyarrow.
+"""
+import argparse
+import csv
+import json
+import math
+import sys
+
+from .diagrams import normalize_distributed_loads
+from .solution import cached_solve, solve_beam
+
+
+# items per load column and how many numeric fields each item has
+LOAD_FIELDS = {"point_loads": 2, "distributed_loads": 4, "moments": 2}
+SUPPORT_TYPES = ("Fixed", "Hinge", "Roller")
+EXTREMES = ("shear", "moment", "deflection")
+# most diagram points one row may ask for; the sampled arrays grow with it, so an unchecked
+# value from a request or an input line could exhaust the process's memory
+MAX_DIAGRAM_POINTS = 100001
+
+
+def _items(value):
+    # a cell as a list of items, each a list of fields
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return []
+    if not isinstance(value, str):
+        return [list(item) for item in value]  # Parquet list column
+    value = value.strip()
+    if value.startswith("["):
+        return json.loads(value)
+    return [item.split(":") for item in value.split(";") if item.strip()]
+
+
+def _number(value, column):
+    # a finite float, or a ValueError naming the column
+    try:
+        number = float(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"{column}: {value!r} is not a number") from None
+    if not math.isfinite(number):
+        raise ValueError(f"{column}: {value!r} is not a finite number")
+    return number
+
+
+def _check_position(position, length, column):
+    if not 0.0 <= position <= length:
+        raise ValueError(f"{column}: position {position:g} is outside the beam (0 to {length:g})")
+
+
+def parse_beam(row):
+    # (supports, point_loads, distributed_loads, moments, length, flexural_rigidity) from one
+    # input row; raises ValueError with the offending column for malformed cells
+    if row.get("length") in (None, ""):
+        raise ValueError("length: missing")
+    length = _number(row["length"], "length")
+    if length <= 0:
+        raise ValueError(f"length: {length:g} is not positive")
+    supports = []
+    for item in _items(row.get("supports")):
+        if len(item) != 2 or str(item[0]).strip().capitalize() not in SUPPORT_TYPES:
+            raise ValueError(f"supports: bad item {item!r}, expected type:position with type one of {', '.join(SUPPORT_TYPES)}")
+        position = _number(item[1], "supports")
+        _check_position(position, length, "supports")
+        supports.append((str(item[0]).strip().capitalize(), position))
+    loads = {}
+    for column, fields in LOAD_FIELDS.items():
+        items = _items(row.get(column))
+        if any(len(item) != fields for item in items):
+            raise ValueError(f"{column}: every item needs {fields} numbers")
+        loads[column] = [tuple(_number(field, column) for field in item) for item in items]
+        # positions lead each item: start and end for a distributed load, else one
+        for item in loads[column]:
+            for position in item[:fields // 2 if column == "distributed_loads" else 1]:
+                _check_position(position, length, column)
+    rigidity = row.get("flexural_rigidity")
+    if rigidity in (None, "") or (isinstance(rigidity, float) and math.isnan(rigidity)):
+        rigidity = None  # an empty cell, or a null in a Parquet column
+    else:
+        rigidity = _number(rigidity, "flexural_rigidity")
+        if rigidity <= 0:
+            raise ValueError(f"flexural_rigidity: {rigidity:g} is not positive")
+    return supports, loads["point_loads"], normalize_distributed_loads(loads["distributed_loads"]), loads["moments"], length, rigidity
+
+
+def solve_row(row, diagram_points=0, cache=None):
+    # one output record; rows that cannot be parsed or solved are reported, not raised.
+    # With a SolverCache, repeated beams are not solved again.
+    record = {"id": row.get("id"), "status": "ok"}
+    try:
+        try:
+            diagram_points = int(diagram_points)
+        except (TypeError, ValueError):
+            diagram_points = -1
+        if not 0 <= diagram_points <= MAX_DIAGRAM_POINTS:
+            raise ValueError(f"points: must be a whole number between 0 and {MAX_DIAGRAM_POINTS}")
+        supports, point_loads, distributed_loads, moments, length, rigidity = parse_beam(row)
+        case = (supports, point_loads, distributed_loads, moments, length, max(diagram_points, 50), rigidity)
+        solution = solve_beam(*case) if cache is None else cached_solve(cache, *case)
+    except (TypeError, ValueError) as error:
+        record["status"] = f"error: {error}"
+        return record
+    if solution is None:
+        record["status"] = "unsolvable"
+        return record
+    record["reactions"] = [float(value) for position, value in solution.reactions]
+    record["support_moments"] = [float(value) for position, value in solution.support_moments]
+    for kind in EXTREMES:
+        for bound in ("max", "min"):
+            extreme = getattr(solution, f"{bound}_{kind}")
+            if extreme is not None:
+                record[f"{bound}_{kind}"], record[f"{bound}_{kind}_at"] = float(extreme[1]), float(extreme[0])
+    if diagram_points:
+        record["x"], record["shear"], record["moment"] = solution.x.tolist(), solution.shear.tolist(), solution.moment.tolist()
+    return record
+
+
+def output_columns(diagram_points=0, deflection=True):
+    columns = ["id", "status", "reactions", "support_moments"]
+    for kind in EXTREMES if deflection else EXTREMES[:2]:
+        columns += [f"max_{kind}", f"max_{kind}_at", f"min_{kind}", f"min_{kind}_at"]
+    if diagram_points:
+        columns += ["x", "shear", "moment"]
+    return columns
+
+
+def _parquet():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet files need pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+
+def read_chunks(path, chunk_size):
+    # lists of row dicts, `chunk_size` rows at a time
+    if str(path).endswith(".parquet"):
+        pyarrow = _parquet()
+        for batch in pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+        return
+    with open(path, newline="") as input_file:
+        chunk = []
+        for row in csv.DictReader(input_file):
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+class _CsvWriter:
+    # list-valued columns are written as JSON so the file stays one row per beam
+    def __init__(self, path, columns):
+        self._file = open(path, "w", newline="")
+        self._writer = csv.DictWriter(self._file, columns, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, records):
+        self._writer.writerows({key: json.dumps(value) if isinstance(value, list) else value for key, value in record.items()} for record in records)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    # one row group per chunk
+    def __init__(self, path, columns):
+        pyarrow = _parquet()
+        self._pyarrow = pyarrow
+        lists = {"reactions", "support_moments", "x", "shear", "moment"}
+        self._schema = pyarrow.schema([
+            (name, pyarrow.string() if name in ("id", "status") else pyarrow.list_(pyarrow.float64()) if name in lists else pyarrow.float64())
+            for name in columns
+        ])
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+
+    def write(self, records):
+        columns = {name: [record.get(name) for record in records] for name in self._schema.names}
+        columns["id"] = [None if value is None else str(value) for value in columns["id"]]
+        self._writer.write_table(self._pyarrow.table(columns, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+def run_bulk(input_path, output_path, chunk_size=256, diagram_points=0):
+    # solve every row of input_path into output_path; returns (rows, rows not solved)
+    columns = output_columns(diagram_points)
+    writer = (_ParquetWriter if str(output_path).endswith(".parquet") else _CsvWriter)(output_path, columns)
+    rows = failed = 0
+    try:
+        for chunk in read_chunks(input_path, chunk_size):
+            records = []
+            for row in chunk:
+                rows += 1
+                if row.get("id") in (None, ""):
+                    row["id"] = rows
+                records.append(solve_row(row, diagram_points))
+            failed += sum(record["status"] != "ok" for record in records)
+            writer.write(records)
+    finally:
+        writer.close()
+    return rows, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m beamcalc bulk", description="Solve every beam in a CSV or Parquet file.")
+    parser.add_argument("input", help="CSV or .parquet file with one beam per row")
+    parser.add_argument("output", help="results file, .parquet for Parquet, anything else for CSV")
+    parser.add_argument("--chunk-size", type=int, default=256, help="rows read, solved and written at a time")
+    parser.add_argument("--diagram-points", type=int, default=0, help="also write x/shear/moment arrays with about this many points")
+    args = parser.parse_args(argv)
+    rows, failed = run_bulk(args.input, args.output, args.chunk_size, args.diagram_points)
+    print(f"{rows} beams read, {failed} could not be solved (see the status column)", file=sys.stderr)
+    return 0
@@ -0,0 +1,60 @@
+"""Bounded LRU cache of solved load cases, keyed by a canonical load-case hash."""
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+# Streamlit reruns the whole script on every widget change, so solved load cases are kept
+# in a bounded LRU cache; one instance is meant to live for the whole process and be shared.
+# `backing` (e.g. a PersistentCache) is consulted on a miss before computing, and receives
+# every newly computed value.
+class SolverCache:
+    def __init__(self, maxsize=256, backing=None):
+        self.maxsize = maxsize
+        self.backing = backing
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        value = self.backing.get(key) if self.backing is not None else None
+        if value is None:
+            value = compute()
+            if self.backing is not None:
+                self.backing.put(key, value)
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+
+def canonical_load_case(supports, point_loads, distributed_loads, moments, beam_length, *settings):
+    # Loads only enter the solution through sums, so they are sorted; supports keep their
+    # order because reactions are reported per support (A, B, ...). Values are rounded so
+    # that float noise from the widgets does not split one load case into several keys.
+    def r(value):
+        return round(float(value), 9)
+    return (
+        r(beam_length),
+        tuple((support_type, r(position)) for support_type, position in supports),
+        tuple(sorted((r(position), r(magnitude)) for position, magnitude in point_loads)),
+        tuple(sorted(tuple(r(value) for value in load) for load in distributed_loads)),
+        tuple(sorted((r(position), r(magnitude)) for position, magnitude in moments)),
+        settings,
+    )
+
+
+def load_case_key(*case):
+    return hashlib.sha256(repr(canonical_load_case(*case)).encode()).hexdigest()
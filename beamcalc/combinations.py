@@ -0,0 +1,50 @@
+"""Load groups, factored combinations and their max/min envelopes."""
+import numpy as np
+
+from .cache import load_case_key
+from .exact import exact_diagrams
+from .reactions import solve_reactions
+from .sampling import adaptive_samples
+from .solution import _read_only
+
+
+# Each load group is solved once; since the beam is linear every factored combination is
+# then just a weighted sum of the per-group arrays, and the envelope is its max/min.
+class LoadEnvelope:
+    __slots__ = ("combinations", "x", "left", "reactions", "shear", "moment", "shear_max", "shear_min", "moment_max", "moment_min")
+
+    def __init__(self, combinations, x, left, reactions, shear, moment):
+        self.combinations = tuple(combinations)  # combination names, one row each below
+        self.x, self.left = _read_only(x, left)
+        self.reactions, self.shear, self.moment = _read_only(reactions, shear, moment)  # (combinations, supports / points)
+        self.shear_max, self.shear_min, self.moment_max, self.moment_min = _read_only(shear.max(axis=0), shear.min(axis=0), moment.max(axis=0), moment.min(axis=0))
+
+
+def solve_group(supports, point_loads, distributed_loads, moments, beam_length):
+    # reactions and exact diagrams of one load group, or None when it can't be solved
+    reactions = solve_reactions(supports, point_loads, distributed_loads, moments, beam_length)
+    if reactions is None:
+        return None
+    support_reactions, support_moments = reactions
+    shear_poly, moment_poly = exact_diagrams(supports, support_reactions, support_moments, point_loads, distributed_loads, moments, beam_length)
+    return np.array([magnitude for position, magnitude in support_reactions]), shear_poly, moment_poly
+
+
+def cached_group(cache, supports, point_loads, distributed_loads, moments, beam_length):
+    key = ("group", load_case_key(supports, point_loads, distributed_loads, moments, beam_length))
+    return cache.get_or_compute(key, lambda: solve_group(supports, point_loads, distributed_loads, moments, beam_length))
+
+
+def load_envelope(group_solutions, combinations, max_points):
+    # group_solutions: {group: solve_group(...)}, combinations: {name: {group: factor}}
+    groups = list(group_solutions)
+    if not combinations or any(group_solutions[group] is None for group in groups):
+        return None
+    polys = [poly for group in groups for poly in group_solutions[group][1:]]
+    x_coords, left = adaptive_samples(polys, max_points)
+
+    reactions = np.stack([group_solutions[group][0] for group in groups])
+    shear = np.stack([group_solutions[group][1](x_coords, left) for group in groups])
+    moment = np.stack([group_solutions[group][2](x_coords, left) for group in groups])
+    factors = np.array([[combination.get(group, 0.0) for group in groups] for combination in combinations.values()])
+    return LoadEnvelope(combinations, x_coords, left, factors @ reactions, factors @ shear, factors @ moment)
@@ -0,0 +1,75 @@
+"""Shear force and bending moment diagrams sampled on a uniform grid."""
+import numpy as np
+
+
+def _step_sum(x_coords, positions, magnitudes):
+    # running total of the magnitudes that act at or before each grid point (x >= position)
+    steps = np.zeros(len(x_coords) + 1)
+    np.add.at(steps, np.searchsorted(x_coords, positions, side="left"), magnitudes)
+    return np.cumsum(steps)[:-1]
+
+
+def normalize_distributed_loads(distributed_loads):
+    # Every engine takes a distributed load as running left to right (start_pos < end_pos) and
+    # ignores one that does not, so a load entered right to left is turned around once, where
+    # the loads come in (the page, parse_beam): positions and magnitudes are swapped together.
+    return [
+        (end_pos, start_pos, end_mag, start_mag) if start_pos > end_pos else (start_pos, end_pos, start_mag, end_mag)
+        for start_pos, end_pos, start_mag, end_mag in distributed_loads
+    ]
+
+
+def _distributed_increments(x_coords, distributed_loads):
+    # load intensity at every grid point times the grid spacing, summed over all distributed loads
+    increments = np.zeros_like(x_coords)
+    if len(x_coords) < 2:
+        return increments
+    step = x_coords[1] - x_coords[0]
+    for start_pos, end_pos, start_mag, end_mag in distributed_loads:
+        if end_pos <= start_pos:
+            continue
+        mask = (x_coords >= start_pos) & (x_coords <= end_pos)
+        x = x_coords[mask]
+        # Calculate the load at position x using linear interpolation
+        increments[mask] += (start_mag + (end_mag - start_mag) * ((x - start_pos) / (end_pos - start_pos))) * step
+    return increments
+
+
+def _support_couples(supports, support_moments):
+    # support moments as couples acting on the beam; a fixed support on the right end acts the other way
+    return [(position, magnitude if position == 0 else -magnitude) for position, magnitude in support_moments]
+
+
+def shear_force(support_reactions, point_loads, distributed_loads, beam_length, resolution):
+    x_coords = np.linspace(0, beam_length, int(beam_length * resolution) + 1)
+
+    # support reactions and point loads are steps at their positions
+    concentrated = list(support_reactions) + list(point_loads)
+    positions = [position for position, magnitude in concentrated]
+    magnitudes = [magnitude for position, magnitude in concentrated]
+    shear = _step_sum(x_coords, positions, magnitudes)
+
+    # every distributed load increment is felt by all positions y >= x, i.e. a cumulative sum
+    shear += np.cumsum(_distributed_increments(x_coords, distributed_loads))
+    return x_coords, shear
+
+
+def bending_moment(supports, support_reactions, support_moments, point_loads, distributed_loads, external_moments, beam_length, resolution):
+    x_coords = np.linspace(0, beam_length, int(beam_length * resolution) + 1)
+
+    # support reactions and point loads: magnitude * (x - position) for x >= position
+    concentrated = list(support_reactions) + list(point_loads)
+    positions = np.array([position for position, magnitude in concentrated], dtype=float)
+    magnitudes = np.array([magnitude for position, magnitude in concentrated], dtype=float)
+    bending_moment = x_coords * _step_sum(x_coords, positions, magnitudes) - _step_sum(x_coords, positions, magnitudes * positions)
+
+    # support moments and external moments are steps at their positions
+    couples = list(external_moments) + _support_couples(supports, support_moments)
+    bending_moment += _step_sum(x_coords, [position for position, magnitude in couples], [magnitude for position, magnitude in couples])
+
+    # distributed loads: sum of (y - x) * increment over x <= y, built from the same
+    # increments as shear_force so that the BMD is the running integral of the SFD
+    increments = _distributed_increments(x_coords, distributed_loads)
+    bending_moment += x_coords * np.cumsum(increments) - np.cumsum(x_coords * increments)
+
+    return x_coords, bending_moment
@@ -0,0 +1,118 @@
+"""Exact shear, moment, slope and deflection diagrams."""
+import threading
+
+import numpy as np
+
+from .diagrams import _support_couples
+from .piecewise import PiecewisePolynomial, _macaulay_polynomial
+from .reactions import solve_reactions
+
+
+def _load_terms(supports, support_reactions, support_moments, point_loads, distributed_loads, external_moments):
+    # (key, shear terms, moment terms) for every reaction, load and couple on its own; the
+    # diagrams are the sum of these contributions. The key is the item's own parameters.
+    groups = []
+    for kind, loads in (("reaction", support_reactions), ("point", point_loads)):
+        for position, magnitude in loads:
+            groups.append(((kind, position, magnitude), [(position, 0, magnitude)], [(position, 1, magnitude)]))
+    for kind, couples in (("moment", external_moments), ("couple", _support_couples(supports, support_moments))):
+        for position, magnitude in couples:
+            groups.append(((kind, position, magnitude), [], [(position, 0, magnitude)]))
+    for start_pos, end_pos, start_mag, end_mag in distributed_loads:
+        if end_pos <= start_pos:
+            continue
+        # w(x) = start_mag<x-start>^0 + slope<x-start>^1 - end_mag<x-end>^0 - slope<x-end>^1
+        slope = (end_mag - start_mag) / (end_pos - start_pos)
+        groups.append((
+            ("distributed", start_pos, end_pos, start_mag, end_mag),
+            [(start_pos, 1, start_mag), (start_pos, 2, slope / 2), (end_pos, 1, -end_mag), (end_pos, 2, -slope / 2)],
+            [(start_pos, 2, start_mag / 2), (start_pos, 3, slope / 6), (end_pos, 2, -end_mag / 2), (end_pos, 3, -slope / 6)],
+        ))
+    return groups
+
+
+def exact_diagrams(supports, support_reactions, support_moments, point_loads, distributed_loads, external_moments, beam_length, contributions=None):
+    groups = _load_terms(supports, support_reactions, support_moments, point_loads, distributed_loads, external_moments)
+    shear_terms = [term for key, shear, moment in groups for term in shear]
+    moment_terms = [term for key, shear, moment in groups for term in moment]
+
+    positions = [position for position, power, coefficient in shear_terms + moment_terms]
+    breaks = np.unique(np.clip([0.0, beam_length] + positions, 0.0, beam_length))
+    # a zero-length last interval holds the value at x = beam_length itself, where the
+    # grid diagrams close back to zero once the loads and reactions at the end are included
+    breaks = np.append(breaks, beam_length)
+    if contributions is not None:
+        return contributions.build(groups, breaks)
+    return _macaulay_polynomial(shear_terms, breaks, 2), _macaulay_polynomial(moment_terms, breaks, 3)
+
+
+# Interactive edits usually change one load at a time, and the diagrams are linear in the
+# loads, so each reaction/load/couple's coefficient arrays are kept and the diagrams are
+# rebuilt as their sum, recomputing only items whose parameters changed (the reactions
+# change with any load magnitude). Contributions are tied to the breakpoints, so moving a
+# load to a new position recomputes everything once. Meant to live in one user session;
+# only the items of the latest build are kept.
+class ContributionCache:
+    def __init__(self):
+        self.reused = 0
+        self.computed = 0
+        self._breaks = None
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def build(self, groups, breaks):
+        with self._lock:
+            if self._breaks is None or not np.array_equal(self._breaks, breaks):
+                self._breaks, self._entries = breaks, {}
+            shear = np.zeros((3, len(breaks) - 1))
+            moment = np.zeros((4, len(breaks) - 1))
+            entries = {}
+            for key, shear_terms, moment_terms in groups:
+                entry = entries.get(key) or self._entries.get(key)
+                if entry is None:
+                    entry = (_macaulay_polynomial(shear_terms, breaks, 2).coeffs, _macaulay_polynomial(moment_terms, breaks, 3).coeffs)
+                    self.computed += 1
+                else:
+                    self.reused += 1
+                entries[key] = entry
+                shear += entry[0]
+                moment += entry[1]
+            self._entries = entries
+        return PiecewisePolynomial(breaks, shear), PiecewisePolynomial(breaks, moment)
+
+    def stats(self):
+        with self._lock:
+            return {"reused": self.reused, "computed": self.computed, "size": len(self._entries)}
+
+
+def solve_exact(supports, point_loads, distributed_loads, moments, beam_length):
+    reactions = solve_reactions(supports, point_loads, distributed_loads, moments, beam_length)
+    if reactions is None:
+        return None
+    support_reactions, support_moments = reactions
+    return exact_diagrams(supports, support_reactions, support_moments, point_loads, distributed_loads, moments, beam_length)
+
+
+# EI v'' = M (sagging positive, deflection upward positive): integrating the moment twice
+# leaves two constants, fixed by the supports (v = 0 at every support, and also v' = 0 at a
+# fixed one). Continuous beams give more conditions than constants; they are consistent
+# for a stiffness solution, so they are solved in the least-squares sense.
+def deflection_diagrams(supports, moment_poly, flexural_rigidity):
+    slope_poly = PiecewisePolynomial(moment_poly.breaks, moment_poly.coeffs / flexural_rigidity).antiderivative()
+    deflection_poly = slope_poly.antiderivative()
+
+    rows, values = [], []
+    for support_type, position in supports:
+        rows.append([position, 1.0])
+        values.append(-deflection_poly(position))
+        if support_type == "Fixed":
+            rows.append([1.0, 0.0])
+            values.append(-slope_poly(position))
+    constants, residual, rank, singular = np.linalg.lstsq(np.array(rows), np.array(values), rcond=None)
+    if rank < 2:
+        return None
+    rotation, offset = constants
+    slope_poly.coeffs[0] += rotation
+    deflection_poly.coeffs[0] += rotation * deflection_poly.breaks[:-1] + offset
+    deflection_poly.coeffs[1] += rotation
+    return slope_poly, deflection_poly
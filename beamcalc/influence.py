@@ -0,0 +1,90 @@
+"""Influence lines and moving axle-train analysis."""
+import numpy as np
+
+from .batch import solve_batch
+
+
+def influence_sections(supports, x_coords):
+    # (sections, left): the grid plus both sides of every support, where the shear jumps and
+    # the hogging moment peaks, in order along the beam. A section with `left` set is the
+    # limit from the left. The right end is only taken from the left: past it every
+    # diagram has closed to zero.
+    beam_length = x_coords[-1]
+    support_pos = np.array([position for support_type, position in supports], dtype=float)
+    right_of = support_pos[support_pos < beam_length]
+    left_of = support_pos[support_pos > 0]
+    sections = np.concatenate([x_coords[:-1], right_of, left_of, [beam_length]])
+    left = np.concatenate([np.zeros(len(x_coords) - 1 + len(right_of), dtype=bool), np.ones(len(left_of) + 1, dtype=bool)])
+    order = np.lexsort((~left, sections))
+    sections, left = sections[order], left[order]
+    keep = np.r_[True, (sections[1:] != sections[:-1]) | (left[1:] != left[:-1])]
+    return sections[keep], left[keep]
+
+
+# Influence lines for a unit downward load rolled over `points` positions, computed as one
+# batch of single-load cases: row i is the unit load at x[i], column j the section at
+# sections[j] (see influence_sections).
+def influence_lines(supports, beam_length, points=201):
+    x_coords = np.linspace(0, beam_length, int(points))
+    sections, left = influence_sections(supports, x_coords)
+    unit_loads = np.stack([x_coords, -np.ones_like(x_coords)], axis=1)[:, None, :]
+    sections, reactions, support_moments, shear, moment = solve_batch(supports, beam_length, point_loads=unit_loads, x_coords=sections, left=left)
+    return x_coords, sections, left, reactions, shear, moment
+
+
+def _shifted_rows(lines, x_coords, load_positions):
+    # influence values for loads at arbitrary positions, interpolated between the rows of
+    # `lines`; a load that is off the beam has no effect
+    step = x_coords[1] - x_coords[0]
+    index = (load_positions - x_coords[0]) / step
+    lower = np.clip(np.floor(index).astype(int), 0, len(x_coords) - 2)
+    fraction = np.clip(index - lower, 0.0, 1.0)[:, None]
+    on_beam = ((load_positions >= x_coords[0]) & (load_positions <= x_coords[-1]))[:, None]
+    return np.where(on_beam, lines[lower] * (1 - fraction) + lines[lower + 1] * fraction, 0.0)
+
+
+class MovingLoadResult:
+    __slots__ = ("x", "front_positions", "shear_max", "shear_min", "moment_max", "moment_min", "max_shear", "max_moment", "max_reactions")
+
+    # effects are (..., vehicle positions, sections) arrays; leading axes are alternatives
+    # that all count towards the envelopes
+    def __init__(self, x, front_positions, shear, moment, reactions):
+        self.x = x
+        self.front_positions = front_positions
+        # envelopes over all vehicle positions, per section
+        self.shear_max, self.shear_min = shear.reshape(-1, len(x)).max(axis=0), shear.reshape(-1, len(x)).min(axis=0)
+        self.moment_max, self.moment_min = moment.max(axis=0), moment.min(axis=0)
+        # absolute maxima as (value, section, front axle position)
+        self.max_shear = self._critical(shear, x)
+        self.max_moment = self._critical(moment, x)
+        # per support as (value, front axle position)
+        self.max_reactions = tuple(self._critical(reactions[:, [i]], x[:1])[::2] for i in range(reactions.shape[1]))
+
+    def _critical(self, effect, sections):
+        index = np.unravel_index(np.argmax(np.abs(effect)), effect.shape)
+        return float(effect[index]), float(sections[index[-1]]), float(self.front_positions[index[-2]])
+
+
+def moving_load(supports, beam_length, axle_loads, axle_offsets, points=201):
+    # axle_loads: downward axle weights (kN); axle_offsets: distance of each axle behind the
+    # front axle (m). The train rolls in from the left until its last axle leaves the beam.
+    x_coords, sections, left, reactions, shear, moment = influence_lines(supports, beam_length, points)
+    # A unit load exactly at a section is on one side of it only, and the shear jumps by the
+    # load there: e.g. next to a support the largest shear is the reaction, reached as the
+    # load approaches from inside the span. The other side's value is a second set of lines.
+    at_section = x_coords[:, None] == sections[None, :]
+    shear_other_side = shear + np.where(left, -1.0, 1.0) * at_section
+    axle_loads = np.asarray(axle_loads, dtype=float)
+    axle_offsets = np.asarray(axle_offsets, dtype=float)
+    step = x_coords[1] - x_coords[0]
+    front_positions = np.arange(0.0, beam_length + axle_offsets.max() + step / 2, step)
+
+    # superpose the influence lines shifted by each axle offset: one (positions, sections)
+    # block per axle, so the cost is independent of the number of vehicle positions in Python
+    all_lines = (reactions, shear, shear_other_side, moment)
+    effects = [np.zeros((len(front_positions), lines.shape[1])) for lines in all_lines]
+    for load, offset in zip(axle_loads, axle_offsets):
+        for effect, lines in zip(effects, all_lines):
+            effect += load * _shifted_rows(lines, x_coords, front_positions - offset)
+    reaction_effect, shear_effect, shear_other_effect, moment_effect = effects
+    return MovingLoadResult(sections, front_positions, np.stack([shear_effect, shear_other_effect]), moment_effect, reaction_effect)
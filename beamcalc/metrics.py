@@ -0,0 +1,91 @@
+"""Per-stage wall-clock timing with rolling percentiles and a Prometheus text export."""
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+# Times the stages of one run (one Streamlit rerun, one batch row, ...); a stage entered
+# more than once in the same run accumulates
+class StageTimer:
+    def __init__(self):
+        self.stages = {}
+        self._start = self._last = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._last = time.perf_counter()
+            self.stages[name] = self.stages.get(name, 0.0) + self._last - start
+
+    def lap(self, name):
+        # for code that is awkward to wrap: the time since the previous stage (or the start)
+        now = time.perf_counter()
+        self.stages[name] = self.stages.get(name, 0.0) + now - self._last
+        self._last = now
+
+    def total(self):
+        return time.perf_counter() - self._start
+
+
+# Rolling per-stage samples for the whole process. Only the latest `window` runs of each
+# stage count towards the percentiles, so the numbers follow current load; count and sum
+# cover every run since start. With `path`, the summary is rewritten after each run in the
+# Prometheus text format (written to a temporary file and renamed, so readers never see
+# a partial file).
+class StageMetrics:
+    def __init__(self, window=1000, path=None, prefix="beamcalc_stage_seconds", description="Wall-clock time per pipeline stage."):
+        self.window = window
+        self.path = path
+        self.prefix = prefix
+        self.description = description
+        self._samples = {}
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def record(self, stages):
+        with self._lock:
+            for name, seconds in stages.items():
+                self._samples.setdefault(name, deque(maxlen=self.window)).append(seconds)
+                count, total = self._totals.get(name, (0, 0.0))
+                self._totals[name] = (count + 1, total + seconds)
+            text = self.prometheus_text() if self.path else None
+        if text is not None:
+            temporary = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporary, "w") as metrics_file:
+                metrics_file.write(text)
+            os.replace(temporary, self.path)
+
+    def summary(self):
+        # {stage: {"count": n, "sum": s, "p50": ..., "p95": ..., "p99": ...}} in seconds
+        with self._lock:
+            samples = {name: np.array(values) for name, values in self._samples.items()}
+            totals = dict(self._totals)
+        result = {}
+        for name, values in samples.items():
+            count, total = totals[name]
+            row = {"count": count, "sum": total}
+            for quantile, value in zip(QUANTILES, np.quantile(values, QUANTILES)):
+                row[f"p{round(quantile * 100)}"] = float(value)
+            result[name] = row
+        return result
+
+    def prometheus_text(self):
+        # caller may hold the lock, so this reads the raw samples rather than summary()
+        lines = [f"# HELP {self.prefix} {self.description}", f"# TYPE {self.prefix} summary"]
+        for name, values in self._samples.items():
+            count, total = self._totals[name]
+            for quantile, value in zip(QUANTILES, np.quantile(np.array(values), QUANTILES)):
+                lines.append(f'{self.prefix}{{stage="{name}",quantile="{quantile}"}} {value:.9g}')
+            lines.append(f'{self.prefix}_sum{{stage="{name}"}} {total:.9g}')
+            lines.append(f'{self.prefix}_count{{stage="{name}"}} {count}')
+        return "\n".join(lines) + "\n"
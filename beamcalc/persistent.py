@@ -0,0 +1,145 @@
+"""Persistent SQLite cache of solved beams, shared by every process using the same file."""
+import hashlib
+import io
+import json
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from .solution import BeamSolution, _read_only
+
+
+_ARRAYS = ("x", "left", "shear", "moment", "slope", "deflection")
+# part of every stored key: bump FORMAT_VERSION when the blob layout changes. The slots are
+# hashed in, so adding or renaming a BeamSolution field also stops old entries from matching
+# (they are evicted like any other stale entry).
+FORMAT_VERSION = 1
+_FORMAT = hashlib.sha256(repr((FORMAT_VERSION, BeamSolution.__slots__, _ARRAYS)).encode()).hexdigest()[:12]
+
+
+def _tuples(value):
+    # JSON gives lists back; BeamSolution keeps tuples
+    return tuple(_tuples(item) for item in value) if isinstance(value, list) else value
+
+
+def pack_solution(solution):
+    # JSON header (scalars and load case) + compressed .npz of the diagram arrays; no
+    # pickle, so a cache file can be shared without trusting whoever else writes to it
+    header = {name: getattr(solution, name) for name in BeamSolution.__slots__ if name not in _ARRAYS}
+    arrays = {name: getattr(solution, name) for name in _ARRAYS if getattr(solution, name) is not None}
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    encoded = json.dumps(header, separators=(",", ":")).encode()
+    return len(encoded).to_bytes(4, "little") + encoded + buffer.getvalue()
+
+
+def unpack_solution(blob):
+    # raises ValueError (or whatever json/np.load raise) for a blob that does not decode
+    size = int.from_bytes(blob[:4], "little")
+    header = json.loads(blob[4:4 + size])
+    if set(header) != set(BeamSolution.__slots__) - set(_ARRAYS):
+        raise ValueError("stored solution does not match BeamSolution's fields")
+    solution = BeamSolution.__new__(BeamSolution)
+    for name, value in header.items():
+        setattr(solution, name, _tuples(value))
+    with np.load(io.BytesIO(blob[4 + size:])) as arrays:
+        for name in _ARRAYS:
+            setattr(solution, name, _read_only(arrays[name])[0] if name in arrays else None)
+    return solution
+
+
+# Second cache tier under SolverCache (see its `backing` argument). Entries are BeamSolutions
+# keyed by the load-case hash and the blob format; other values and keys are ignored. Every
+# process opens its own connections (one per thread), SQLite's locking and WAL journal make
+# concurrent readers and writers safe, and the least recently used entries are deleted once
+# the stored blobs exceed `max_bytes`. Any database error, and any entry that no longer
+# decodes (corrupt, or written by another version), is treated as a miss, never as a
+# failed solve.
+class PersistentCache:
+    def __init__(self, path, max_bytes=256 * 2**20, timeout=5.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._local = threading.local()
+        self._connect()
+
+    def _connect(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS solutions_accessed ON solutions (accessed)")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key):
+        if not isinstance(key, str):
+            return None
+        key = f"{_FORMAT}:{key}"
+        try:
+            connection = self._connect()
+            row = connection.execute("SELECT value FROM solutions WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                connection.execute("UPDATE solutions SET accessed = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error:
+            self.errors += 1
+            return None
+        if row is None:
+            self.misses += 1
+            return None
+        try:
+            solution = unpack_solution(row[0])
+        except Exception:
+            # a corrupt entry: drop it, so it is stored again once solved
+            self.errors += 1
+            self.misses += 1
+            try:
+                connection.execute("DELETE FROM solutions WHERE key = ?", (key,))
+            except sqlite3.Error:
+                pass
+            return None
+        self.hits += 1
+        return solution
+
+    def put(self, key, value):
+        if not isinstance(key, str) or not isinstance(value, BeamSolution):
+            return
+        key = f"{_FORMAT}:{key}"
+        blob = pack_solution(value)
+        if len(blob) > self.max_bytes:
+            return
+        try:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")  # one writer at a time across processes
+            try:
+                connection.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?)", (key, blob, len(blob), time.time()))
+                excess = connection.execute("SELECT COALESCE(SUM(size), 0) FROM solutions").fetchone()[0] - self.max_bytes
+                if excess > 0:
+                    # oldest first, until enough bytes are freed
+                    stale = []
+                    for stale_key, size in connection.execute("SELECT key, size FROM solutions ORDER BY accessed"):
+                        if excess <= 0:
+                            break
+                        stale.append((stale_key,))
+                        excess -= size
+                    connection.executemany("DELETE FROM solutions WHERE key = ?", stale)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            self.errors += 1
+
+    def stats(self):
+        try:
+            entries, nbytes = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM solutions").fetchone()
+        except sqlite3.Error:
+            entries = nbytes = None
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors, "size": entries, "nbytes": nbytes, "max_bytes": self.max_bytes}
@@ -0,0 +1,89 @@
+"""Exact piecewise-polynomial representation of beam diagrams."""
+import math
+
+import numpy as np
+
+
+# V(x) and M(x) are sums of Macaulay terms c * <x - a>^n, so between two consecutive
+# load/support positions they are plain polynomials (degree <= 2 for shear, <= 3 for moment).
+class PiecewisePolynomial:
+    def __init__(self, breaks, coeffs):
+        self.breaks = np.asarray(breaks, dtype=float)  # (n + 1,) interval edges
+        self.coeffs = np.asarray(coeffs, dtype=float)  # (degree + 1, n), coeffs[k, i] multiplies (x - breaks[i])**k
+
+    def __call__(self, x, left=None):
+        # right-continuous like the grid diagrams (x >= position); where `left` is True the
+        # value just before x is returned instead, which gives both sides of a jump
+        x = np.asarray(x, dtype=float)
+        idx = np.searchsorted(self.breaks, x, side="right") - 1
+        if left is not None:
+            idx = np.where(left, np.searchsorted(self.breaks, x, side="left") - 1, idx)
+        idx = np.clip(idx, 0, self.coeffs.shape[1] - 1)
+        t = x - self.breaks[idx]
+        value = np.zeros_like(t)
+        for k in range(self.coeffs.shape[0] - 1, -1, -1):
+            value = value * t + self.coeffs[k, idx]
+        return value
+
+    def _stationary_points(self):
+        # roots of the derivative strictly inside each interval, in closed form up to a
+        # quadratic derivative (shear and moment) and with np.roots beyond that
+        n = self.coeffs.shape[1]
+        lengths = np.diff(self.breaks)
+        derivative = self.derivative().coeffs
+        if derivative.shape[0] > 3:
+            points = []
+            for i in range(n):
+                roots = np.roots(derivative[::-1, i]) if np.any(derivative[:, i]) else np.array([])
+                roots = roots.real[np.abs(roots.imag) < 1e-12]
+                points.extend(self.breaks[i] + roots[(roots > 0) & (roots < lengths[i])])
+            return np.array(points)
+        slope = np.zeros((3, n))
+        slope[:derivative.shape[0]] = derivative
+        c0, c1, c2 = slope
+        with np.errstate(divide="ignore", invalid="ignore"):
+            linear_root = -c0 / c1
+            discriminant = np.sqrt(c1 ** 2 - 4 * c2 * c0)
+            quadratic_roots = [(-c1 + discriminant) / (2 * c2), (-c1 - discriminant) / (2 * c2)]
+        roots = np.concatenate([np.where(c2 == 0, linear_root, np.nan)] + [np.where(c2 != 0, r, np.nan) for r in quadratic_roots])
+        inside = np.isfinite(roots) & (roots > 0) & (roots < np.tile(lengths, 3))
+        return roots[inside] + np.tile(self.breaks[:-1], 3)[inside]
+
+    def extrema(self):
+        # ((x_min, min), (x_max, max)) over the beam, checking both sides of every breakpoint
+        # and the stationary points inside each interval
+        stationary = self._stationary_points()
+        x = np.concatenate([self.breaks, self.breaks, stationary])
+        left = np.concatenate([np.zeros(len(self.breaks), dtype=bool), np.ones(len(self.breaks), dtype=bool), np.zeros(len(stationary), dtype=bool)])
+        values = self(x, left)
+        lowest, highest = np.argmin(values), np.argmax(values)
+        return (float(x[lowest]), float(values[lowest])), (float(x[highest]), float(values[highest]))
+
+    def derivative(self):
+        degree = self.coeffs.shape[0] - 1
+        if degree == 0:
+            return PiecewisePolynomial(self.breaks, np.zeros_like(self.coeffs))
+        return PiecewisePolynomial(self.breaks, self.coeffs[1:] * np.arange(1, degree + 1)[:, None])
+
+    def antiderivative(self):
+        # integral from breaks[0]; each interval starts from the accumulated area of the
+        # previous ones (a cumulative sum), so the result is continuous
+        degree = self.coeffs.shape[0] - 1
+        coeffs = np.zeros((degree + 2, self.coeffs.shape[1]))
+        coeffs[1:] = self.coeffs / np.arange(1, degree + 2)[:, None]
+        lengths = np.diff(self.breaks)
+        areas = sum(coeffs[k] * lengths ** k for k in range(1, degree + 2))
+        coeffs[0] = np.concatenate([[0.0], np.cumsum(areas)[:-1]])
+        return PiecewisePolynomial(self.breaks, coeffs)
+
+
+def _macaulay_polynomial(terms, breaks, degree):
+    # terms: [(position, power, coefficient)] for coefficient * (x - position)**power, x >= position
+    coeffs = np.zeros((degree + 1, len(breaks) - 1))
+    starts = breaks[:-1]
+    for position, power, coefficient in terms:
+        offset = starts - position
+        active = offset >= 0
+        for k in range(power + 1):
+            coeffs[k, active] += coefficient * math.comb(power, k) * offset[active] ** (power - k)
+    return PiecewisePolynomial(breaks, coeffs)
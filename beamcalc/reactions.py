@@ -0,0 +1,131 @@
+"""Support reactions of a beam."""
+import numpy as np
+
+from .stiffness import solve_stiffness
+
+
+def _first_moment(start_pos, end_pos, start_mag, end_mag):
+    # moment of a linearly varying load about x = 0. Unlike resultant * centroid, this stays
+    # right when the resultant is zero.
+    return (end_pos - start_pos) / 6 * (start_mag * (2 * start_pos + end_pos) + end_mag * (start_pos + 2 * end_pos))
+
+
+def calculate_reactions(supports, point_loads, distributed_loads, moments, beam_length):
+    num_supports = len(supports)
+    if num_supports == 1:
+        for support_types, position in supports:
+            if support_types == "Fixed":
+                sum_point_loads = 0
+                sum_dist_loads = 0
+                sum_point_loads_moments = 0
+                sum_dist_loads_moments = 0
+                sum_external_moments = 0
+
+                fixed_support_pos = position
+
+                for position, magnitude in point_loads:
+                    sum_point_loads += magnitude
+                    sum_point_loads_moments += magnitude * abs(position - fixed_support_pos)
+
+                for start_pos, end_pos, start_mag, end_mag in distributed_loads:
+                    if end_pos <= start_pos:
+                        continue  # see normalize_distributed_loads
+                    dist_load = 0.5 * (start_mag + end_mag) * (end_pos - start_pos)
+                    sum_dist_loads += dist_load
+                    if fixed_support_pos == 0:
+                        sum_dist_loads_moments += _first_moment(start_pos, end_pos, start_mag, end_mag)
+                    else:
+                        sum_dist_loads_moments += beam_length * dist_load - _first_moment(start_pos, end_pos, start_mag, end_mag)
+
+                for position, magnitude in moments:
+                    sum_external_moments += magnitude
+
+                reaction_1 = -sum_point_loads - sum_dist_loads
+                # moments at a fixed right end are reported with the opposite sign (see
+                # _support_couples), so the applied couples enter it the other way round
+                if fixed_support_pos == 0:
+                    moment_1 = sum_point_loads_moments + sum_dist_loads_moments - sum_external_moments
+                else:
+                    moment_1 = sum_point_loads_moments + sum_dist_loads_moments + sum_external_moments
+
+                reaction_moment = [reaction_1, moment_1]
+                reaction_moment_pos = []
+                for support_types, position in supports:
+                    reaction_moment_pos.append(position)
+                reactions = []
+                for i in reaction_moment:
+                    reactions.append((reaction_moment_pos[0],i))
+
+                return reactions
+            else:
+                return False
+    elif num_supports == 2:
+        if any(support_type == "Fixed" for support_type, position in supports):
+            return False
+        else:
+            sum_point_loads = 0
+            sum_dist_loads = 0
+            sum_point_loads_moments = 0
+            sum_dist_loads_moments = 0
+            sum_external_moments = 0
+
+            for position, magnitude in point_loads:
+                sum_point_loads += magnitude
+                sum_point_loads_moments += magnitude*(position)
+            for start_pos, end_pos, start_mag, end_mag in distributed_loads:
+                if end_pos <= start_pos:
+                    continue  # see normalize_distributed_loads
+                sum_dist_loads += 0.5 * (start_mag + end_mag) * (end_pos - start_pos)
+                sum_dist_loads_moments += _first_moment(start_pos, end_pos, start_mag, end_mag)
+
+            for position, magnitude in moments:
+                sum_external_moments += magnitude
+            
+            # [(1,1), (support_1_pos, support_2_pos)]*[(r1, r2)] = [(sum_point_load+sum_dist_load), (sum_point_moment+sum_dist_moment+sum_external_moment)]
+            # format: Ax = B
+            # formula: x = np.linalg.solve(A, B) 
+
+            reaction_coefficient_mat = [(1,1)]
+            support_position = []
+            for support_type, position in supports:
+                support_position.append(position)
+            reaction_coefficient_mat.append(support_position)
+            # st.write(reaction_coefficient_mat)
+
+            constant_mat = [(sum_point_loads + sum_dist_loads), (sum_point_loads_moments + sum_dist_loads_moments - sum_external_moments)]
+            # st.write(constant_mat)
+
+            try:
+                r = np.linalg.solve(reaction_coefficient_mat, constant_mat)
+                r1, r2 = -r
+            except np.linalg.LinAlgError:
+                r1 = 0
+                r2 = 0
+
+        reaction_mag = [r1, r2]
+        reaction_pos = []
+        for support_types, position in supports:
+            reaction_pos.append(position)
+        reactions = []
+        for a, b in zip(reaction_pos, reaction_mag):
+            reactions.append((a,b))
+
+        return reactions
+    else:
+        return False
+
+
+def split_reactions(supports, reactions):
+    # calculate_reactions gives [(pos, reaction), (pos, moment)] for a single fixed support
+    if len(supports) == 1:
+        return [reactions[0]], [reactions[1]]
+    return reactions, []
+
+
+def solve_reactions(supports, point_loads, distributed_loads, moments, beam_length):
+    # (support_reactions, support_moments); statically determinate beams go through
+    # calculate_reactions, everything else through the stiffness method
+    reactions = calculate_reactions(supports, point_loads, distributed_loads, moments, beam_length)
+    if reactions == False:
+        return solve_stiffness(supports, point_loads, distributed_loads, moments, beam_length)
+    return split_reactions(supports, reactions)
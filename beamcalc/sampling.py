@@ -0,0 +1,47 @@
+"""Breakpoint-aware adaptive sampling of piecewise polynomials."""
+import numpy as np
+
+
+def adaptive_samples(polys, max_points, tolerance=None):
+    # Sample points for plotting one or more PiecewisePolynomials on a shared x.
+    # Every breakpoint is sampled exactly (twice where any curve jumps: the value just
+    # before it, then the value at it), and the remaining points go to the intervals where
+    # the curves bend. With n sub-intervals on an interval of length h the chord error is
+    # about (h/n)^2 * |f''| / 8, so n is proportional to h * sqrt(|f''|) for equal error.
+    # `tolerance` is that error relative to each curve's range; `max_points` caps the total.
+    breaks = np.unique(np.concatenate([poly.breaks for poly in polys]))
+    starts, ends = breaks[:-1], breaks[1:]
+    before = np.ones(len(breaks), dtype=bool)
+
+    # breakpoints where any curve jumps get a left-limit sample too
+    jumps = np.zeros(len(breaks), dtype=bool)
+    curvature = np.zeros(len(starts))
+    for poly in polys:
+        right = poly(breaks)
+        left = poly(breaks, left=before)
+        scale = max(np.abs(right).max(), np.abs(left).max()) or 1.0
+        jumps[1:] |= np.abs(right[1:] - left[1:]) > 1e-9 * scale
+        second = poly.derivative().derivative()
+        bend = np.maximum(np.abs(second(starts)), np.abs(second(ends, left=np.ones(len(ends), dtype=bool))))
+        curvature = np.maximum(curvature, bend / scale)
+
+    weight = (ends - starts) * np.sqrt(curvature)
+    budget = max(int(max_points) - len(breaks) - int(jumps.sum()), 0)
+    if tolerance is not None:
+        counts = np.ceil(weight / np.sqrt(8 * tolerance)) - 1
+    else:
+        counts = np.floor(budget * weight / weight.sum()) if weight.sum() > 0 else np.zeros(len(starts))
+    counts = np.maximum(counts, 0)
+    if counts.sum() > budget:
+        counts = np.floor(counts * budget / counts.sum())
+    counts = counts.astype(int)
+
+    # evenly spaced interior points, counts[k] of them inside interval k
+    interval = np.repeat(np.arange(len(starts)), counts)
+    rank = np.arange(len(interval)) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    interior = starts[interval] + (ends - starts)[interval] * rank / (counts[interval] + 1)
+
+    x = np.concatenate([breaks, breaks[jumps], interior])
+    left = np.concatenate([np.zeros(len(breaks), dtype=bool), np.ones(int(jumps.sum()), dtype=bool), np.zeros(len(interior), dtype=bool)])
+    order = np.lexsort((~left, x))
+    return x[order], left[order]
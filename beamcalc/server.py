@@ -0,0 +1,347 @@
+"""Local HTTP API for the solver, with micro-batching of diagram requests.
+
+    python -m beamcalc serve [--host 127.0.0.1] [--port 8765] [--batch-window 5] [--max-batch 256]
+
+Models are the JSON objects of ``beamcalc.bulk``/``beamcalc.worker``.
+
+    POST /v1/solve      reactions and exact max/min shear, moment (and deflection with
+                        ``flexural_rigidity``), as the worker returns them
+    POST /v1/diagrams   reactions plus shear and moment sampled at ``points`` (default 201)
+                        evenly spaced positions. Requests arriving within the batch window
+                        on the same beam (supports, length, points) are solved together
+                        by solve_batch, in chunks of at most ELEMENT_BUDGET grid values.
+                        Send ``Accept: application/x-npz`` or ``?format=npz`` to get the
+                        arrays as an .npz file instead of JSON.
+    GET  /v1/metrics    request counts, errors, batching and latency percentiles as JSON
+                        (``?format=prometheus`` for the text format)
+
+Models with more than MAX_LOADS loads or MAX_POINTS points are rejected with a 400.
+"""
+import argparse
+import io
+import json
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from .batch import solve_batch
+from .bulk import MAX_DIAGRAM_POINTS, parse_beam, solve_row
+from .cache import SolverCache
+from .exact import solve_exact
+from .metrics import StageMetrics
+from .reactions import solve_reactions
+
+
+NPZ_TYPE = "application/x-npz"
+MAX_BODY = 2**20
+DEFAULT_POINTS = 201
+MAX_POINTS = MAX_DIAGRAM_POINTS
+MAX_LOADS = 256  # point loads, distributed loads and moments together, per model
+# most (case, load, point) values one solve_batch call may build; its Macaulay blocks are
+# dense, so this bounds the memory of a batch however many requests and loads it holds
+ELEMENT_BUDGET = 2**20
+
+
+def _points(model, default, minimum):
+    try:
+        points = int(model.get("points", default))
+    except (TypeError, ValueError):
+        raise ValueError("points: must be a whole number") from None
+    if not minimum <= points <= MAX_POINTS:
+        raise ValueError(f"points: must be between {minimum} and {MAX_POINTS}")
+    return points
+
+
+def _check_loads(point_loads, distributed_loads, moments):
+    if len(point_loads) + len(distributed_loads) + len(moments) > MAX_LOADS:
+        raise ValueError(f"at most {MAX_LOADS} loads per model")
+
+
+def _padded(cases, fields):
+    # per-case load lists to one zero-padded (cases, n, fields) array; zero magnitudes add nothing
+    width = max((len(loads) for loads in cases), default=0)
+    array = np.zeros((len(cases), width, fields))
+    for i, loads in enumerate(cases):
+        if loads:
+            array[i, :len(loads)] = loads
+    return array
+
+
+def _width(supports, case):
+    # loads of the widest kind in a case, i.e. its size along solve_batch's load axis
+    return max(len(supports), *(len(loads) for loads in case), 1)
+
+
+def _solve_chunk(supports, length, x_coords, cases):
+    # one solve_batch call per slice of x_coords, so no block exceeds ELEMENT_BUDGET
+    width = max(_width(supports, case) for case in cases)
+    step = max(ELEMENT_BUDGET // (len(cases) * width), 1)
+    loads = (_padded([case[0] for case in cases], 2), _padded([case[1] for case in cases], 4), _padded([case[2] for case in cases], 2))
+    shear, moment = [], []
+    for start in range(0, len(x_coords), step):
+        x_slice, reactions, support_moments, shear_slice, moment_slice = solve_batch(supports, length, *loads, x_coords=x_coords[start:start + step])
+        shear.append(shear_slice)
+        moment.append(moment_slice)
+    return reactions, support_moments, np.concatenate(shear, axis=1), np.concatenate(moment, axis=1)
+
+
+def solve_diagram_group(supports, length, points, cases):
+    # cases: [(point_loads, distributed_loads, moments), ...] on one beam -> result dicts.
+    # Cases are batched narrowest first, so a request with many loads only pads its own chunk.
+    x_coords = np.linspace(0, length, points)
+    order = sorted(range(len(cases)), key=lambda i: _width(supports, cases[i]))
+    chunks, chunk = [], []
+    for i in order:
+        if chunk and (len(chunk) + 1) * _width(supports, cases[i]) * points > ELEMENT_BUDGET:
+            chunks.append(chunk)
+            chunk = []
+        chunk.append(i)
+    chunks.append(chunk)
+    results = [None] * len(cases)
+    for chunk in chunks:
+        try:
+            reactions, support_moments, shear, moment = _solve_chunk(supports, length, x_coords, [cases[i] for i in chunk])
+        except ValueError:
+            # layouts solve_batch does not handle (continuous, propped, ...) go one by one
+            return [_solve_diagram_exact(supports, length, x_coords, *case) for case in cases]
+        for j, i in enumerate(chunk):
+            results[i] = {"x": x_coords, "reactions": reactions[j], "support_moments": support_moments[j], "shear": shear[j], "moment": moment[j]}
+    return results
+
+
+def _solve_diagram_exact(supports, length, x_coords, point_loads, distributed_loads, moments):
+    reactions = solve_reactions(supports, point_loads, distributed_loads, moments, length)
+    polys = solve_exact(supports, point_loads, distributed_loads, moments, length)
+    if reactions is None or polys is None:
+        return None
+    support_reactions, support_moments = reactions
+    shear_poly, moment_poly = polys
+    return {
+        "x": x_coords, "reactions": np.array([value for position, value in support_reactions], dtype=float),
+        "support_moments": np.array([value for position, value in support_moments], dtype=float),
+        "shear": shear_poly(x_coords), "moment": moment_poly(x_coords),
+    }
+
+
+# Collects diagram requests for up to `window` seconds (or `max_batch` requests) after the
+# first one arrives, then solves each group of requests on the same beam in one call
+class MicroBatcher:
+    def __init__(self, window=0.005, max_batch=256):
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.batched_requests = 0
+        self.largest_batch = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, supports, length, points, loads):
+        future = Future()
+        self._queue.put(((tuple(supports), length, points), loads, future))
+        return future
+
+    def _run(self):
+        while True:
+            pending = [self._queue.get()]
+            deadline = time.perf_counter() + self.window
+            while len(pending) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    pending.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            groups = {}
+            for beam, loads, future in pending:
+                groups.setdefault(beam, []).append((loads, future))
+            for (supports, length, points), requests in groups.items():
+                self.batches += 1
+                self.batched_requests += len(requests)
+                self.largest_batch = max(self.largest_batch, len(requests))
+                try:
+                    results = solve_diagram_group(list(supports), length, points, [loads for loads, future in requests])
+                except Exception as error:
+                    for loads, future in requests:
+                        future.set_exception(error)
+                    continue
+                for (loads, future), result in zip(requests, results):
+                    future.set_result(result)
+
+    def stats(self):
+        return {
+            "batches": self.batches, "batched_requests": self.batched_requests, "largest_batch": self.largest_batch,
+            "mean_batch": self.batched_requests / self.batches if self.batches else 0.0,
+        }
+
+
+class SolverService:
+    # everything the request handlers share: caches, the batcher and the counters
+    def __init__(self, window=0.005, max_batch=256):
+        self.cache = SolverCache(maxsize=1024)
+        self.batcher = MicroBatcher(window, max_batch)
+        self.latency = StageMetrics(window=10000, prefix="beamcalc_http_request_seconds", description="Request latency per endpoint (label: stage).")
+        self.started = time.time()
+        self.requests = {}
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def count(self, endpoint, seconds, ok):
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            self.errors += not ok
+        self.latency.record({endpoint: seconds})
+
+    def solve(self, model):
+        points = _points(model, 0, 0)
+        _check_loads(*parse_beam(model)[1:4])
+        return solve_row(model, points, self.cache)
+
+    def diagrams(self, model, timeout=30):
+        supports, point_loads, distributed_loads, moments, length, rigidity = parse_beam(model)
+        points = _points(model, DEFAULT_POINTS, 2)
+        _check_loads(point_loads, distributed_loads, moments)
+        result = self.batcher.submit(supports, length, points, (point_loads, distributed_loads, moments)).result(timeout)
+        if result is None:
+            return {"id": model.get("id"), "status": "unsolvable"}
+        return {"id": model.get("id"), "status": "ok", **result}
+
+    def metrics(self):
+        uptime = time.time() - self.started
+        with self._lock:
+            requests, errors = dict(self.requests), self.errors
+        total = sum(requests.values())
+        return {
+            "uptime": uptime, "requests": requests, "errors": errors, "requests_per_second": total / uptime if uptime else 0.0,
+            "batching": self.batcher.stats(), "latency_seconds": self.latency.summary(),
+        }
+
+    def prometheus_text(self):
+        metrics = self.metrics()
+        lines = [self.latency.prometheus_text().rstrip("\n"), "# TYPE beamcalc_http_errors_total counter", f"beamcalc_http_errors_total {metrics['errors']}"]
+        lines += ["# TYPE beamcalc_http_batches_total counter", f"beamcalc_http_batches_total {metrics['batching']['batches']}"]
+        lines += ["# TYPE beamcalc_http_batched_requests_total counter", f"beamcalc_http_batched_requests_total {metrics['batching']['batched_requests']}"]
+        return "\n".join(lines) + "\n"
+
+
+def _npz(result):
+    buffer = io.BytesIO()
+    np.savez(buffer, **{name: np.asarray(value, dtype=float) for name, value in result.items() if name not in ("id", "status")})
+    return buffer.getvalue()
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class SolverHandler(BaseHTTPRequestHandler):
+    service = None  # set by make_server
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # the metrics endpoint replaces per-request logging
+
+    def _send(self, status, body, content_type="application/json"):
+        if not isinstance(body, bytes):
+            try:
+                body = json.dumps(body, separators=(",", ":"), default=_json_default, allow_nan=False).encode()
+            except ValueError:
+                # NaN and Infinity are not JSON; _handle answers 400 before anything is sent
+                raise ValueError("result is not finite") from None
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_model(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length < 0:
+            raise ValueError("negative Content-Length")  # rfile.read(-1) would wait for the client to close
+        if length > MAX_BODY:
+            raise ValueError(f"request body over {MAX_BODY} bytes")
+        model = json.loads(self.rfile.read(length) or b"null")
+        if not isinstance(model, dict):
+            raise ValueError("expected a JSON object")
+        return model
+
+    def _handle(self, endpoint, respond):
+        start = time.perf_counter()
+        status = 500
+        try:
+            status = respond()
+        except (TypeError, ValueError) as error:
+            status = 400
+            self._send(status, {"status": f"error: {error}"})
+        except Exception as error:
+            self._send(status, {"status": f"error: {error!r}"})
+        finally:
+            self.service.count(endpoint, time.perf_counter() - start, status < 400)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path != "/v1/metrics":
+            return self._send(404, {"status": "error: not found"})
+
+        def respond():
+            if parse_qs(url.query).get("format") == ["prometheus"]:
+                self._send(200, self.service.prometheus_text().encode(), "text/plain; version=0.0.4")
+            else:
+                self._send(200, self.service.metrics())
+            return 200
+        self._handle("metrics", respond)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path not in ("/v1/solve", "/v1/diagrams"):
+            return self._send(404, {"status": "error: not found"})
+        binary = parse_qs(url.query).get("format") == ["npz"] or NPZ_TYPE in (self.headers.get("Accept") or "")
+
+        def respond():
+            model = self._read_model()
+            if url.path == "/v1/solve":
+                self._send(200, self.service.solve(model))
+                return 200
+            result = self.service.diagrams(model)
+            if binary and result["status"] == "ok":
+                self._send(200, _npz(result), NPZ_TYPE)
+            else:
+                self._send(200, result)
+            return 200
+        self._handle(url.path.rsplit("/", 1)[1], respond)
+
+
+class SolverHTTPServer(ThreadingHTTPServer):
+    request_queue_size = 128  # the default of 5 resets connections under concurrent clients
+
+
+def make_server(host="127.0.0.1", port=8765, window=0.005, max_batch=256):
+    handler = type("BoundSolverHandler", (SolverHandler,), {"service": SolverService(window, max_batch)})
+    return SolverHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m beamcalc serve", description="Serve the solver over HTTP on this machine.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--batch-window", type=float, default=5.0, help="milliseconds to gather diagram requests into one batch")
+    parser.add_argument("--max-batch", type=int, default=256, help="most requests solved in one batch")
+    args = parser.parse_args(argv)
+    server = make_server(args.host, args.port, args.batch_window / 1000, args.max_batch)
+    print(f"serving on http://{args.host}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
@@ -0,0 +1,87 @@
+"""One-shot beam solve producing a BeamSolution."""
+import io
+
+import numpy as np
+
+from .cache import load_case_key
+from .exact import deflection_diagrams, exact_diagrams
+from .reactions import solve_reactions
+from .sampling import adaptive_samples
+
+
+def _read_only(*arrays):
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
+class BeamSolution:
+    # everything the page shows for one load case, produced by a single solve
+    __slots__ = (
+        "beam_length", "supports", "point_loads", "distributed_loads", "moments",
+        "reactions", "support_moments", "x", "left", "shear", "moment",
+        "min_shear", "max_shear", "min_moment", "max_moment",
+        "flexural_rigidity", "slope", "deflection", "min_deflection", "max_deflection",
+    )
+
+    def __init__(self, beam_length, supports, point_loads, distributed_loads, moments, reactions, support_moments, x, left, shear, moment, shear_extrema, moment_extrema,
+                 flexural_rigidity=None, slope=None, deflection=None, deflection_extrema=(None, None)):
+        self.beam_length = beam_length
+        self.supports = tuple(supports)
+        self.point_loads = tuple(point_loads)
+        self.distributed_loads = tuple(distributed_loads)
+        self.moments = tuple(moments)
+        self.reactions = tuple(reactions)              # ((position, reaction), ...) one per support
+        self.support_moments = tuple(support_moments)  # ((position, moment),) for a fixed support
+        self.x, self.left, self.shear, self.moment = _read_only(x, left, shear, moment)
+        self.min_shear, self.max_shear = shear_extrema     # (position, value)
+        self.min_moment, self.max_moment = moment_extrema  # (position, value)
+        # slope (rad) and deflection (m) for the given EI (kNm^2), None when not computed
+        self.flexural_rigidity = flexural_rigidity
+        self.slope, self.deflection = (None, None) if slope is None else _read_only(slope, deflection)
+        self.min_deflection, self.max_deflection = deflection_extrema
+
+    def to_dict(self):
+        data = {name: getattr(self, name) for name in self.__slots__}
+        for name in ("x", "left", "shear", "moment", "slope", "deflection"):
+            if data[name] is not None:
+                data[name] = data[name].tolist()
+        return data
+
+    def to_csv(self):
+        # full-resolution diagrams; `left` is 1 on the left-limit sample of a jump
+        names = ["x", "left", "shear", "moment"] + (["slope", "deflection"] if self.deflection is not None else [])
+        buffer = io.StringIO()
+        np.savetxt(buffer, np.column_stack([getattr(self, name) for name in names]), delimiter=",", fmt="%.10g", header=",".join(names), comments="")
+        return buffer.getvalue()
+
+
+def solve_beam(supports, point_loads, distributed_loads, moments, beam_length, max_points, flexural_rigidity=None, contributions=None):
+    # `contributions`: an optional ContributionCache reused between edits of the same beam
+    reactions = solve_reactions(supports, point_loads, distributed_loads, moments, beam_length)
+    if reactions is None:
+        return None
+    support_reactions, support_moments = reactions
+    shear_poly, moment_poly = exact_diagrams(supports, support_reactions, support_moments, point_loads, distributed_loads, moments, beam_length, contributions)
+    deflection_polys = deflection_diagrams(supports, moment_poly, flexural_rigidity) if flexural_rigidity else None
+    # the cubic deflection bends where shear and moment are straight (a tip-loaded
+    # cantilever), so its curvature shares the sample budget
+    sampled = [shear_poly, moment_poly] + list(deflection_polys or [])
+    x_coords, left = adaptive_samples(sampled, max_points)
+    deflection = {}
+    if deflection_polys is not None:
+        slope_poly, deflection_poly = deflection_polys
+        deflection = dict(
+            flexural_rigidity=flexural_rigidity, slope=slope_poly(x_coords), deflection=deflection_poly(x_coords),
+            deflection_extrema=deflection_poly.extrema(),
+        )
+    return BeamSolution(
+        beam_length, supports, point_loads, distributed_loads, moments, support_reactions, support_moments,
+        x_coords, left, shear_poly(x_coords, left), moment_poly(x_coords, left),
+        shear_poly.extrema(), moment_poly.extrema(), **deflection,
+    )
+
+
+def cached_solve(cache, supports, point_loads, distributed_loads, moments, beam_length, max_points, flexural_rigidity=None, contributions=None):
+    key = load_case_key(supports, point_loads, distributed_loads, moments, beam_length, int(max_points), flexural_rigidity)
+    return cache.get_or_compute(key, lambda: solve_beam(supports, point_loads, distributed_loads, moments, beam_length, max_points, flexural_rigidity, contributions))
@@ -0,0 +1,121 @@
+"""Direct stiffness method for continuous and statically indeterminate beams."""
+import numpy as np
+
+
+# Beam elements between every support and load position, with a vertical deflection and a
+# rotation at each node. Each node only couples to its neighbours, so the global stiffness
+# matrix is banded (3 diagonals above the main one) and is stored as band[d, i] = K[i, i + d].
+STIFFNESS_BANDWIDTH = 3
+
+
+def solve_banded(band, rhs):
+    # Gaussian elimination on a symmetric positive definite banded matrix without pivoting,
+    # O(n * bandwidth^2). Returns None if the matrix is singular (the beam is a mechanism).
+    band = band.copy()
+    rhs = np.array(rhs, dtype=float)
+    bandwidth, n = band.shape[0] - 1, band.shape[1]
+    # each pivot is judged against its own diagonal entry: element stiffnesses scale with
+    # 1/length^3, so a short element next to long ones would fail a tolerance on the largest
+    tolerance = 1e-10 * band[0].copy()
+    for k in range(n):
+        pivot = band[0, k]
+        if pivot <= tolerance[k]:
+            return None
+        for a in range(1, min(bandwidth, n - 1 - k) + 1):
+            factor = band[a, k] / pivot
+            if factor == 0:
+                continue
+            # row k + a -= factor * row k, within the band
+            band[:bandwidth + 1 - a, k + a] -= factor * band[a:, k]
+            rhs[k + a] -= factor * rhs[k]
+    solution = np.zeros(n)
+    for k in range(n - 1, -1, -1):
+        width = min(bandwidth, n - 1 - k)
+        solution[k] = (rhs[k] - band[1:width + 1, k] @ solution[k + 1:k + 1 + width]) / band[0, k]
+    return solution
+
+
+def _banded_matvec(band, vector):
+    product = band[0] * vector
+    for d in range(1, band.shape[0]):
+        product[:-d] += band[d, :-d] * vector[d:]
+        product[d:] += band[d, :-d] * vector[:-d]
+    return product
+
+
+def solve_stiffness(supports, point_loads, distributed_loads, moments, beam_length, flexural_rigidity=1.0):
+    # Reactions of any supported beam (continuous, propped, fixed-fixed, ...). The result has the
+    # same form as split_reactions: reactions per support, and moments at fixed supports.
+    # Reactions of a beam with constant EI do not depend on its value.
+    positions = [0.0, beam_length]
+    positions += [position for support_type, position in supports]
+    positions += [position for position, magnitude in list(point_loads) + list(moments)]
+    positions += [pos for start_pos, end_pos, start_mag, end_mag in distributed_loads for pos in (start_pos, end_pos)]
+    nodes = np.unique(np.clip(positions, 0.0, beam_length))
+    ndof = 2 * len(nodes)
+    lengths = np.diff(nodes)
+
+    # element stiffness (v1, theta1, v2, theta2), rotations counter-clockwise
+    h = lengths
+    ones = np.ones_like(h)
+    k = np.array([
+        [12 * ones, 6 * h, -12 * ones, 6 * h],
+        [6 * h, 4 * h ** 2, -6 * h, 2 * h ** 2],
+        [-12 * ones, -6 * h, 12 * ones, -6 * h],
+        [6 * h, 2 * h ** 2, -6 * h, 4 * h ** 2],
+    ]) * (flexural_rigidity / h ** 3)
+    band = np.zeros((STIFFNESS_BANDWIDTH + 1, ndof))
+    first_dof = 2 * np.arange(len(lengths))
+    for a in range(4):
+        for d in range(4 - a):
+            np.add.at(band[d], first_dof + a, k[a, a + d])
+
+    # nodal loads: point loads and applied moments (clockwise positive) sit on nodes, and the
+    # linearly varying distributed loads become equivalent nodal forces element by element
+    loads = np.zeros(ndof)
+    for position, magnitude in point_loads:
+        loads[2 * np.searchsorted(nodes, min(max(position, 0.0), beam_length))] += magnitude
+    for position, magnitude in moments:
+        loads[2 * np.searchsorted(nodes, min(max(position, 0.0), beam_length)) + 1] -= magnitude
+    w1 = np.zeros(len(lengths))
+    w2 = np.zeros(len(lengths))
+    for start_pos, end_pos, start_mag, end_mag in distributed_loads:
+        if end_pos <= start_pos:
+            continue
+        inside = (nodes[:-1] >= start_pos) & (nodes[1:] <= end_pos)
+        slope = (end_mag - start_mag) / (end_pos - start_pos)
+        w1 += np.where(inside, start_mag + slope * (nodes[:-1] - start_pos), 0.0)
+        w2 += np.where(inside, start_mag + slope * (nodes[1:] - start_pos), 0.0)
+    np.add.at(loads, first_dof, h * (7 * w1 + 3 * w2) / 20)
+    np.add.at(loads, first_dof + 1, h ** 2 * (3 * w1 + 2 * w2) / 60)
+    np.add.at(loads, first_dof + 2, h * (3 * w1 + 7 * w2) / 20)
+    np.add.at(loads, first_dof + 3, -h ** 2 * (2 * w1 + 3 * w2) / 60)
+
+    # supports: no deflection, and no rotation at a fixed support
+    support_nodes = [int(np.searchsorted(nodes, min(max(position, 0.0), beam_length))) for support_type, position in supports]
+    restrained = sorted({2 * node for node in support_nodes} | {2 * node + 1 for node, (support_type, position) in zip(support_nodes, supports) if support_type == "Fixed"})
+    constrained = band.copy()
+    rhs = loads.copy()
+    for dof in restrained:
+        constrained[:, dof] = 0.0
+        for d in range(1, STIFFNESS_BANDWIDTH + 1):
+            if dof - d >= 0:
+                constrained[d, dof - d] = 0.0
+        constrained[0, dof] = 1.0
+        rhs[dof] = 0.0
+    displacements = solve_banded(constrained, rhs)
+    if displacements is None:
+        return None
+    nodal_reactions = _banded_matvec(band, displacements) - loads
+
+    # report each restrained node's reaction once, on the first support at that node
+    support_reactions, support_moments = [], []
+    seen = set()
+    for node, (support_type, position) in zip(support_nodes, supports):
+        first = node not in seen
+        seen.add(node)
+        support_reactions.append((position, float(nodal_reactions[2 * node]) if first else 0.0))
+        if support_type == "Fixed":
+            couple = -float(nodal_reactions[2 * node + 1]) if first else 0.0
+            support_moments.append((position, couple if position == 0 else -couple))
+    return support_reactions, support_moments
@@ -0,0 +1,114 @@
+"""Long-lived NDJSON solver: one beam model per line on stdin, one result per line on stdout.
+
+    python -m beamcalc worker [--workers N] [--diagram-points 0] [--max-pending 64]
+
+A model is a JSON object with the columns of ``beamcalc.bulk`` (``length``, ``supports``,
+``point_loads``, ``distributed_loads``, ``moments``, optional ``id``,
+``flexural_rigidity``, and ``points`` (at most 100001) to override --diagram-points for
+that line):
+
+    {"id": 1, "length": 10, "supports": [["Hinge", 0], ["Roller", 10]], "point_loads": [[4, -10]]}
+
+Each result has the bulk runner's fields plus ``max_abs_shear``/``max_abs_moment`` and
+their positions, and is written (and flushed) in input order. Every worker keeps a warm
+solver cache across lines, and at most --max-pending lines are in flight: past that the
+worker stops reading stdin, so a fast producer is held back by the pipe.
+"""
+import argparse
+import json
+import queue
+import sys
+import threading
+
+from .bulk import solve_row
+from .cache import SolverCache
+
+
+# per process, so repeated models are served warm for the lifetime of the worker
+_cache = SolverCache(maxsize=1024)
+
+
+def solve_line(line, diagram_points=0):
+    # one input line to one output line (without the newline); never raises
+    try:
+        model = json.loads(line)
+        if not isinstance(model, dict):
+            raise ValueError("expected a JSON object")
+    except ValueError as error:
+        return json.dumps({"id": None, "status": f"error: invalid JSON model ({error})"}, separators=(",", ":"))
+    record = solve_row(model, model.get("points", diagram_points), _cache)
+    for kind in ("shear", "moment"):
+        if f"max_{kind}" in record:
+            bound = "max" if abs(record[f"max_{kind}"]) >= abs(record[f"min_{kind}"]) else "min"
+            record[f"max_abs_{kind}"], record[f"max_abs_{kind}_at"] = abs(record[f"{bound}_{kind}"]), record[f"{bound}_{kind}_at"]
+    # NaN and Infinity are not JSON, and strict readers reject the whole line
+    try:
+        return json.dumps(record, separators=(",", ":"), allow_nan=False)
+    except ValueError:
+        record_id = record["id"] if isinstance(record["id"], (str, int)) else None
+        return json.dumps({"id": record_id, "status": "error: result is not finite"}, separators=(",", ":"))
+
+
+def _write_results(pending, output):
+    # writer thread: results in submission order, each flushed as soon as it is ready. It
+    # keeps draining after a failure so the reading side never blocks on a full queue.
+    closed = False
+    while True:
+        future = pending.get()
+        if future is None:
+            return
+        try:
+            line = future.result()
+        except Exception as error:  # e.g. a worker process died
+            line = json.dumps({"id": None, "status": f"error: {error!r}"}, separators=(",", ":"))
+        if closed:
+            continue
+        try:
+            output.write(line + "\n")
+            output.flush()
+        except BrokenPipeError:
+            closed = True
+
+
+def serve(input_lines, output, workers=1, diagram_points=0, max_pending=64):
+    # solve every non-blank line of input_lines; returns the number of lines answered
+    if workers <= 1:
+        count = 0
+        for line in input_lines:
+            if line.strip():
+                output.write(solve_line(line, diagram_points) + "\n")
+                output.flush()
+                count += 1
+        return count
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # the bounded queue is the backpressure: submitting blocks while max_pending results
+    # are waiting to be written, and then stdin is not read any further
+    pending = queue.Queue(maxsize=max_pending)
+    writer = threading.Thread(target=_write_results, args=(pending, output), daemon=True)
+    writer.start()
+    count = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            for line in input_lines:
+                if line.strip():
+                    pending.put(executor.submit(solve_line, line, diagram_points))
+                    count += 1
+        finally:
+            pending.put(None)
+            writer.join()
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m beamcalc worker", description="Solve NDJSON beam models from stdin to stdout.")
+    parser.add_argument("--workers", type=int, default=1, help="solver processes (1 solves in this process)")
+    parser.add_argument("--diagram-points", type=int, default=0, help="also return x/shear/moment arrays with about this many points")
+    parser.add_argument("--max-pending", type=int, default=64, help="lines in flight before reading stdin pauses")
+    args = parser.parse_args(argv)
+    try:
+        serve(sys.stdin, sys.stdout, args.workers, args.diagram_points, args.max_pending)
+    except (BrokenPipeError, KeyboardInterrupt):
+        return 1
+    return 0
@@ -0,0 +1,162 @@
+"""Benchmarks for the solver and render paths, with a stored baseline and regression check.
+
+Times calculate_reactions, shear_force and bending_moment over beam lengths, resolutions
+(points per metre) and load counts, plus the exact solve used by the page, figure
+rendering, and the others/t1.py bending_moment prototype (timed, and checked against
+bending_moment on the same grid). Results are written as JSON and compared with the
+baseline; any benchmark slower than the baseline by more than the threshold fails.
+
+    python benchmarks/bench.py                      # run, compare with baseline.json
+    python benchmarks/bench.py --json results.json  # also save this run
+    python benchmarks/bench.py --update-baseline    # accept this run as the new baseline
+"""
+import argparse
+import importlib.util
+import json
+import platform
+import sys
+import time
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import plots  # noqa: E402
+from beamcalc import bending_moment, calculate_reactions, shear_force, solve_beam, split_reactions  # noqa: E402
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+LENGTHS = (10, 100)
+RESOLUTIONS = (10, 100, 1000)
+LOAD_COUNTS = (1, 10, 50)
+RENDER_POINTS = (400, 5000)
+# the prototype loops in Python over every point for every load (and over every point pair
+# for distributed loads), so it only runs where grid points * (loads + 1) stays small
+T1_MAX_WORK = 20000
+# ignore differences below this, they are timer noise rather than regressions
+NOISE_FLOOR = 5e-6
+
+
+def load_case(beam_length, count):
+    # simply supported beam with `count` point loads, distributed loads and moments
+    rng = np.random.RandomState(count)
+    supports = [("Hinge", 0.0), ("Roller", float(beam_length))]
+    positions = np.round(rng.uniform(0, beam_length, (3, count)), 2)
+    magnitudes = np.round(rng.uniform(-50, -1, (3, count)), 1)
+    point_loads = list(zip(positions[0].tolist(), magnitudes[0].tolist()))
+    ends = np.round(np.minimum(positions[1] + beam_length / 4, beam_length), 2)
+    distributed_loads = list(zip(positions[1].tolist(), ends.tolist(), magnitudes[1].tolist(), magnitudes[2].tolist()))
+    moments = list(zip(positions[2].tolist(), (-magnitudes[2]).tolist()))
+    return supports, point_loads, distributed_loads, moments, float(beam_length)
+
+
+def timed(function, repeat):
+    # best time per call over `repeat` runs of an auto-ranged number of calls
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def load_t1():
+    path = ROOT / "others" / "t1.py"
+    spec = importlib.util.spec_from_file_location("t1", path)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except ImportError as error:  # it imports streamlit, which a bare solver env may lack
+        print(f"skipping others/t1.py: {error}", file=sys.stderr)
+        return None
+    return module
+
+
+def run(repeat):
+    results = {}
+    t1 = load_t1()
+    for beam_length in LENGTHS:
+        for count in LOAD_COUNTS:
+            supports, point_loads, distributed_loads, moments, length = load_case(beam_length, count)
+            tag = f"L={beam_length},loads={count}"
+            results[f"calculate_reactions[{tag}]"] = timed(lambda: calculate_reactions(supports, point_loads, distributed_loads, moments, length), repeat)
+            support_reactions, support_moments = split_reactions(supports, calculate_reactions(supports, point_loads, distributed_loads, moments, length))
+            for points in RENDER_POINTS:
+                results[f"solve_beam[{tag},points={points}]"] = timed(lambda: solve_beam(supports, point_loads, distributed_loads, moments, length, points), repeat)
+
+            for resolution in RESOLUTIONS:
+                tag = f"L={beam_length},res={resolution},loads={count}"
+                results[f"shear_force[{tag}]"] = timed(lambda: shear_force(support_reactions, point_loads, distributed_loads, length, resolution), repeat)
+                results[f"bending_moment[{tag}]"] = timed(
+                    lambda: bending_moment(supports, support_reactions, support_moments, point_loads, distributed_loads, moments, length, resolution), repeat)
+
+                if t1 is not None and (beam_length * resolution + 1) * (count + 1) <= T1_MAX_WORK:
+                    # t1 takes reactions as point loads and a step size instead of points per metre
+                    t1_args = ([], support_reactions + point_loads, distributed_loads, moments, length, 1 / resolution)
+                    results[f"t1.bending_moment[{tag}]"] = timed(lambda: t1.bending_moment(*t1_args), 1)
+                    x_t1, moment_t1 = t1.bending_moment(*t1_args)
+                    x, moment = bending_moment(supports, support_reactions, support_moments, point_loads, distributed_loads, moments, length, resolution)
+                    n = min(len(x), len(x_t1))
+                    scale = np.abs(moment).max() or 1.0
+                    print(f"t1 vs bending_moment [{tag}]: max difference {np.abs(moment_t1[:n] - moment[:n]).max() / scale:.2%} of peak", file=sys.stderr)
+
+    supports, point_loads, distributed_loads, moments, length = load_case(LENGTHS[-1], LOAD_COUNTS[-1])
+    for points in RENDER_POINTS:
+        solution = solve_beam(supports, point_loads, distributed_loads, moments, length, points)
+        results[f"render_shear[points={points}]"] = timed(lambda: plots.render_png(plots.plot_shear(solution)), 1)
+        results[f"render_moment[points={points}]"] = timed(lambda: plots.render_png(plots.plot_moment(solution)), 1)
+    return results
+
+
+def compare(results, baseline, threshold):
+    # returns the names of benchmarks slower than baseline * (1 + threshold)
+    regressions = []
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"new   {name:55} {seconds * 1e3:10.3f} ms")
+            continue
+        ratio = seconds / reference
+        regressed = ratio > 1 + threshold and seconds - reference > NOISE_FLOOR
+        if regressed:
+            regressions.append(name)
+        print(f"{'SLOW' if regressed else 'ok':5} {name:55} {seconds * 1e3:10.3f} ms  x{ratio:.2f} of baseline")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7, help="timing runs per benchmark (best is kept)")
+    parser.add_argument("--json", type=Path, help="write this run's results to a JSON file")
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="baseline JSON to compare with")
+    parser.add_argument("--threshold", type=float, default=0.5, help="allowed slowdown as a fraction (0.5 = 50%%; tighten on a quiet machine)")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline instead of comparing")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": run(args.repeat),
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --update-baseline first")
+        return 0
+    regressions = compare(report["results"], json.loads(args.baseline.read_text())["results"], args.threshold)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Cold-start import-time budget for the solver package, the plotting module and the page.
+
+Each entry is imported in a fresh interpreter with ``-X importtime`` and the median
+cumulative import time is compared with its budget. Budgets sit just above the times
+measured on a development machine, so a real regression fails; pass ``--scale`` on slower
+machines instead of raising them. Entries that must stay light are also checked for heavy
+imports they must not pull in. Exits with status 1 on any regression.
+
+    python benchmarks/import_time.py [--runs 5] [--scale 1.0]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# modules imported together -> (budget in ms, modules they must not import). Measured
+# medians: beamcalc 105-120 ms (almost all numpy), plots ~15 ms, and the page's own import
+# chain (app.py's imports, in its order) ~500 ms, mostly streamlit.
+BUDGETS = {
+    "beamcalc": (140.0, ("streamlit", "matplotlib")),
+    "plots": (25.0, ("matplotlib",)),
+    "streamlit, plots, beamcalc": (600.0, ("matplotlib",)),
+}
+
+
+def import_time_ms(modules):
+    # cumulative time of the comma-separated top-level `modules`, imported in one statement
+    # as reported by -X importtime (microseconds on stderr); shared dependencies count once
+    names = [name.strip() for name in modules.split(",")]
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modules}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] in names:
+            times[fields[2]] = int(fields[1]) / 1000
+    missing = [name for name in names if name not in times]
+    if missing:
+        raise RuntimeError(f"no import timing reported for {', '.join(missing)}")
+    return sum(times.values())
+
+
+def forbidden_imports(module, forbidden):
+    code = f"import sys, {module}; print(' '.join(m for m in {forbidden!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per module (median is used)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget, e.g. for slow CI machines")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module, (budget, forbidden) in BUDGETS.items():
+        median = statistics.median(import_time_ms(module) for _ in range(args.runs))
+        limit = budget * args.scale
+        heavy = forbidden_imports(module, forbidden)
+        status = "ok" if median <= limit and not heavy else "FAIL"
+        failed |= status == "FAIL"
+        print(f"{status:4} {module:28} {median:8.1f} ms (budget {limit:.0f} ms)" + (f", imports {', '.join(heavy)}" if heavy else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+# Lets pytest import beamcalc from the repository root without installing it.
@@ -0,0 +1,571 @@
+"""Matplotlib figures for the Streamlit page.
+
+matplotlib is only imported when the first figure is drawn, with the non-interactive Agg
+backend pinned, so importing this module (and starting the page) stays cheap. Figures are
+built with the object-oriented Figure API and never registered with pyplot, so nothing
+outside the caller holds on to them and they are freed as soon as they are encoded. That
+also makes it safe to draw several figures at once from threads; render_executor also
+offers a process pool (RenderPool), which runs them in parallel on multi-core servers.
+"""
+import hashlib
+import io
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# Icons used in the beam sketch: name -> (file in icons/, zoom passed to OffsetImage)
+ICON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons")
+ICONS = {
+    "fixed_left": ("fixed_support_left.png", 0.5),
+    "fixed_right": ("fixed_support_right.png", 0.5),
+    "hinge": ("hinge_support.png", 0.3),
+    "roller": ("roller_support.png", 0.3),
+    "moment_clockwise": ("moment_clockwise.png", 0.13),
+    "moment_anticlockwise": ("moment_anticlockwise.png", 0.13),
+}
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Same encoding st.pyplot uses, so cached images look identical to directly rendered ones
+SAVEFIG_OPTIONS = {"format": "png", "bbox_inches": "tight", "dpi": 200}
+# Most vertices one diagram line is drawn with; a 12 in figure is ~1200 px wide at 100 dpi
+MAX_PLOT_VERTICES = 2000
+
+
+# every figure drawn by this module, for the memory metric; entries vanish once freed
+_live_figures = weakref.WeakSet()
+
+
+def _subplots(*args, figsize, **kwargs):
+    # like pyplot's subplots, but the figure is not kept alive by a global figure manager
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    _live_figures.add(fig)
+    return fig, fig.subplots(*args, **kwargs)
+
+
+def render_png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, **SAVEFIG_OPTIONS)
+    fig.clear()  # drop artists (and their arrays) now rather than at the next GC cycle
+    return buffer.getvalue()
+
+
+def render_plot(plot, *args):
+    # draw and encode in one call, so it can run in a worker thread or process
+    return render_png(plot(*args))
+
+
+# Worker processes are forked, all at once when the pool is first used: spawned workers
+# would re-run the Streamlit script, which is what __main__ points at. CPython resets the
+# import and logging locks in forked children, and matplotlib is first imported inside the
+# workers. Once a worker dies (e.g. killed for memory) a ProcessPoolExecutor refuses all
+# further work, so the pool replaces itself; the figures that were in flight then fail
+# with BrokenProcessPool and FigureCache draws them inline instead.
+class RenderPool:
+    def __init__(self, workers=None):
+        self.workers = workers
+        self.restarts = 0
+        self._lock = threading.Lock()
+        self._executor = self._start()
+
+    def _start(self):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("fork"))
+
+    def _restart(self, broken):
+        with self._lock:
+            if self._executor is not broken:
+                return  # another caller already replaced it
+            self._executor = self._start()
+            self.restarts += 1
+        broken.shutdown(wait=False)
+
+    def submit(self, fn, *args):
+        from concurrent.futures.process import BrokenProcessPool
+
+        with self._lock:
+            executor = self._executor
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._restart(executor)
+            raise
+
+        def check(done):
+            if not done.cancelled() and isinstance(done.exception(), BrokenProcessPool):
+                self._restart(executor)
+        future.add_done_callback(check)
+        return future
+
+    def worker_pids(self):
+        with self._lock:
+            return list(getattr(self._executor, "_processes", None) or ())
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+def render_executor(mode, workers=None):
+    # "serial" (None: render inline), "threads" or "processes" (a RenderPool; threads where
+    # fork is unavailable)
+    import multiprocessing
+
+    if mode == "serial":
+        return None
+    if mode == "processes" and "fork" in multiprocessing.get_all_start_methods():
+        return RenderPool(workers)
+    if mode in ("threads", "processes"):
+        from concurrent.futures import ThreadPoolExecutor
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="render")
+    raise ValueError(f"Unknown render mode {mode!r}, expected serial, threads or processes")
+
+
+def _rss_mb(pid="self"):
+    # resident set size from Linux /proc; None where that is unavailable
+    try:
+        with open(f"/proc/{pid}/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def memory_sample(executor=None):
+    # one point of the figure/memory metric: figures still alive, figures held by pyplot
+    # (should stay 0) and resident set size in MB (Linux /proc, else peak RSS). Figures
+    # drawn by a RenderPool live in its workers, so their RSS is sampled too; their figures
+    # are freed by render_png before the image is returned.
+    import sys
+
+    pyplot = sys.modules.get("matplotlib.pyplot")
+    rss = _rss_mb()
+    if rss is None:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (2**20 if sys.platform == "darwin" else 2**10)
+    workers = [_rss_mb(pid) for pid in executor.worker_pids()] if isinstance(executor, RenderPool) else []
+    return {
+        "time": time.time(),
+        "figures": len(_live_figures),
+        "pyplot_figures": len(pyplot.get_fignums()) if pyplot else 0,
+        "rss_mb": round(rss, 1),
+        "workers": len(workers),
+        "workers_rss_mb": round(sum(value for value in workers if value is not None), 1),
+    }
+
+
+def figure_key(kind, *model):
+    # `model` identifies what is drawn (e.g. a load-case key); the drawing settings are
+    # part of the key so that changing them never serves a stale image
+    settings = (kind, MAX_PLOT_VERTICES, sorted(SAVEFIG_OPTIONS.items()))
+    return hashlib.sha256(repr((settings, model)).encode()).hexdigest()
+
+
+# Rasterizing is the most expensive step of a rerun, so encoded figures are kept in an LRU
+# cache bounded by total bytes (PNG sizes vary a lot); one instance serves the whole process
+class FigureCache:
+    def __init__(self, maxbytes=64 * 2**20):
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def _store(self, key, image):
+        with self._lock:
+            if key not in self._entries and len(image) <= self.maxbytes:
+                self._entries[key] = image
+                self.nbytes += len(image)
+                while self.nbytes > self.maxbytes:
+                    self.nbytes -= len(self._entries.popitem(last=False)[1])
+
+    def submit(self, key, executor, plot, *args):
+        # Future of the PNG for plot(*args): already done on a hit, otherwise rendered on
+        # `executor` (inline when None). With a process pool, plot and args must pickle, and
+        # a figure whose worker died is drawn inline rather than failing the page.
+        from concurrent.futures.process import BrokenProcessPool
+
+        image = self._lookup(key)
+        if image is None and executor is not None:
+            try:
+                pending = executor.submit(render_plot, plot, *args)
+            except BrokenProcessPool:
+                pending = None
+            if pending is not None:
+                future = Future()
+
+                def finish(done):
+                    if done.cancelled():
+                        future.cancel()
+                        return
+                    error = done.exception()
+                    if isinstance(error, BrokenProcessPool):
+                        try:
+                            image = render_plot(plot, *args)
+                        except Exception as inline_error:
+                            future.set_exception(inline_error)
+                            return
+                    elif error is not None:
+                        future.set_exception(error)
+                        return
+                    else:
+                        image = done.result()
+                    self._store(key, image)
+                    future.set_result(image)
+                pending.add_done_callback(finish)
+                return future
+        if image is None:
+            image = render_plot(plot, *args)
+            self._store(key, image)
+        future = Future()
+        future.set_result(image)
+        return future
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "nbytes": self.nbytes, "maxbytes": self.maxbytes}
+
+
+def decimate(x, *ys, max_vertices=MAX_PLOT_VERTICES):
+    # Min/max-per-column downsampling for drawing only (the full arrays stay on the solution).
+    # x is split into equal-width columns and each column keeps its first and last sample
+    # plus the smallest and largest value of every y, so the drawn outline and the peaks are
+    # unchanged. Both samples of every jump (repeated x) are kept as well. All ys share x.
+    import numpy as np
+
+    x = np.asarray(x)
+    ys = [np.asarray(y) for y in ys]
+    if len(x) <= max_vertices:
+        return (x, *ys)
+    columns = max(max_vertices // (2 + 2 * len(ys)), 1)
+    span = (x[-1] - x[0]) or 1.0
+    column = np.minimum(((x - x[0]) / span * columns).astype(int), columns - 1)
+
+    keep = np.zeros(len(x), dtype=bool)
+    first = np.flatnonzero(np.r_[True, column[1:] != column[:-1]])
+    keep[first] = True
+    keep[np.r_[first[1:] - 1, len(x) - 1]] = True
+    for y in ys:
+        order = np.lexsort((y, column))
+        change = np.flatnonzero(column[order][1:] != column[order][:-1])
+        keep[order[np.r_[0, change + 1]]] = True        # column minimum
+        keep[order[np.r_[change, len(x) - 1]]] = True   # column maximum
+    jump = np.flatnonzero(x[1:] == x[:-1])
+    keep[jump] = True
+    keep[jump + 1] = True
+    return (x[keep], *(y[keep] for y in ys))
+
+
+def with_extrema(x, y, *extrema):
+    # add exact (position, value) peaks that fall between samples, so they survive decimate
+    import numpy as np
+
+    points = [point for point in extrema if point is not None and not np.isin(point[0], x)]
+    if not points:
+        return x, y
+    positions, values = np.array(points, dtype=float).T
+    at = np.searchsorted(x, positions)
+    return np.insert(x, at, positions), np.insert(y, at, values)
+
+
+def check_icons():
+    # cheap startup check (no matplotlib): every icon file exists and is a PNG
+    bad = []
+    for filename, zoom in ICONS.values():
+        path = os.path.join(ICON_DIR, filename)
+        if not os.path.isfile(path):
+            bad.append(filename)
+            continue
+        with open(path, "rb") as icon_file:
+            if icon_file.read(len(PNG_SIGNATURE)) != PNG_SIGNATURE:
+                bad.append(filename)
+    if bad:
+        raise FileNotFoundError(f"Missing or unreadable icon files in {ICON_DIR}: {', '.join(bad)}")
+
+
+_icon_atlas = None
+_icon_lock = threading.Lock()
+
+
+def icon_atlas():
+    # load_icons() once per process (the page and every render worker share one copy)
+    global _icon_atlas
+    with _icon_lock:
+        if _icon_atlas is None:
+            _icon_atlas = load_icons()
+        return _icon_atlas
+
+
+def load_icons():
+    # decoded arrays, marked read-only so one copy can be shared by every session
+    import matplotlib.image as mpimg
+
+    check_icons()
+    atlas = {}
+    for name, (filename, zoom) in ICONS.items():
+        image = mpimg.imread(os.path.join(ICON_DIR, filename))
+        image.setflags(write=False)
+        atlas[name] = (image, zoom)
+    return atlas
+
+
+def icon_box(icon):
+    from matplotlib.offsetbox import OffsetImage
+
+    image, zoom = icon
+    return OffsetImage(image, zoom=zoom)
+
+
+# Display the beam with supports, loads and moments
+def plot_beam(supports, point_loads, distributed_loads, moments, beam_length, icons=None):
+    from matplotlib.offsetbox import AnnotationBbox
+
+    if icons is None:
+        icons = icon_atlas()
+
+    fig, ax = _subplots(figsize=(12, 4))
+    ax.plot([0, beam_length], [0,0], 'b-', lw=20)
+
+    ax.set_xlim(-beam_length * 0.1, beam_length * 1.1)
+    ax.set_ylim(-1, 1)
+    ax.get_yaxis().set_visible(False) # Hide y-axis
+
+    ##Support
+    for support_type, position in supports:
+        if support_type == "Fixed":
+            # Use the fixed support icon
+            if position == beam_length:
+                imagebox = icon_box(icons["fixed_right"])
+            else:
+                imagebox = icon_box(icons["fixed_left"])
+            ab = AnnotationBbox(imagebox, (position, 0), frameon=False)
+            ax.add_artist(ab)
+        elif support_type == "Hinge":
+            # Use the hinge support icon
+            imagebox = icon_box(icons["hinge"])
+            ab = AnnotationBbox(imagebox, (position, -.14), frameon=False)
+            ax.add_artist(ab)
+        elif support_type == "Roller":
+            # Use the roller support icon
+            imagebox = icon_box(icons["roller"])
+            ab = AnnotationBbox(imagebox, (position, -.14), frameon=False)
+            ax.add_artist(ab)
+
+    ##Point Load
+    max_magnitude = max((abs(mag) for _, mag in point_loads), default=0) # Find the maximum magnitude
+    # st.write(max_magnitude)
+    # Loop through point loads to draw arrows with adjusted positions and directions
+    for position, magnitude in point_loads:
+        if max_magnitude == 0:
+            continue
+        # Calculate arrow length based on magnitude, scaled to fit within the y-limits
+        direction = 1 if magnitude > 0 else (-1 if magnitude < 0 else 0)  # Downward if positive, upward if negative
+
+        if direction == 0:
+            continue
+
+        # Determine the starting y-coordinate based on load direction and beam thickness
+        start_y = -.22 * direction if magnitude > 0 else -.22 * direction
+
+        # Draw the arrow with the adjusted y-coordinate and length based on the load's sign and magnitude
+        ax.arrow(
+            position,              # x-coordinate of arrow's starting point
+            start_y,               # y-coordinate of arrow's starting point
+            0,                     # No horizontal movement, vertical arrow
+            direction * .01,  # Adjust length by direction and scaled magnitude
+            head_width=0.2,        # Width of the arrow head
+            head_length=0.1,       # Length of the arrow head
+            fc='red',              # Fill color of arrow
+            ec='red'               # Edge color of arrow
+        )
+        # Calculate the line length proportionally based on the max magnitude
+        line_length = direction * max(0.3, (abs(magnitude) / max_magnitude) * 0.8)
+        # st.write(line_length)
+
+        # Draw the red line from the arrowhead
+        ax.plot([position, position], [start_y, -line_length], 'r-', lw=1.5)
+        
+        point_loads_text = -line_length - 0.10 if magnitude > 0 else -line_length + 0.05
+        ax.text(position, point_loads_text, f'{abs(magnitude)} kN', color='red', ha='center')
+
+
+
+    ## Distributed Load
+    max_dist_magnitude = max((abs(mag) for _, _, mag1, mag2 in distributed_loads for mag in [mag1, mag2]), default=0)
+    # st.write(max_dist_magnitude)
+
+    for start_pos, end_pos, start_mag, end_mag in distributed_loads:
+        if max_dist_magnitude == 0:
+            continue
+
+        # Calculate directions based on magnitude signs
+        start_direction = 1 if start_mag > 0 else (-1 if start_mag < 0 else 0)
+        end_direction = 1 if end_mag > 0 else (-1 if end_mag < 0 else 0)
+
+        # Determine starting y-coordinates
+        start_y = -0.22 * start_direction if start_direction != 0 else 0
+        end_y = -0.22 * end_direction if end_direction != 0 else 0
+
+        # Calculate line lengths proportionally based on max magnitude
+        start_line_length = start_direction * max(0.3, (abs(start_mag) / max_dist_magnitude) * 0.8) if start_direction != 0 else 0
+        end_line_length = end_direction * max(0.3, (abs(end_mag) / max_dist_magnitude) * 0.8) if end_direction != 0 else 0
+
+        # Draw arrows at the start and end positions if direction is non-zero
+        if start_direction != 0:
+            ax.arrow(
+                start_pos,
+                start_y,
+                0,
+                start_direction * 0.01,
+                head_width=0.2,
+                head_length=0.1,
+                fc='green',
+                ec='green'
+            )
+        if end_direction != 0:
+            ax.arrow(
+                end_pos,
+                end_y,
+                0,
+                end_direction * 0.01,
+                head_width=0.2,
+                head_length=0.1,
+                fc='green',
+                ec='green'
+            )
+
+        # Draw the green lines from the arrowheads or connect the fill directly to y=0
+        ax.plot([start_pos, start_pos], [start_y, -start_line_length], 'g-', lw=1.5)
+        ax.plot([end_pos, end_pos], [end_y, -end_line_length], 'g-', lw=1.5)
+
+        # Connect the ends of the arrows and fill the area between
+        x_coords = [start_pos, start_pos, end_pos, end_pos]
+        y_coords = [-start_line_length if start_direction != 0 else 0, 0, 0, -end_line_length if end_direction != 0 else 0]
+        ax.fill(x_coords, y_coords, color='green', alpha=0.3)
+
+        # Label distributed load magnitudes at the start and end positions if direction is non-zero
+        if start_direction != 0:
+            start_pos_text = -start_line_length - 0.10 if start_mag > 0 else -start_line_length + 0.03
+            ax.text(
+                start_pos,
+                start_pos_text,
+                f'{abs(start_mag)} kN/m',
+                color='green',
+                ha='center'
+            )
+        if end_direction != 0:
+            end_pos_text = -end_line_length - 0.10 if end_mag > 0 else -end_line_length + 0.03
+            ax.text(
+                end_pos,
+                end_pos_text,
+                f'{abs(end_mag)} kN/m',
+                color='green',
+                ha='center'
+            )
+
+    ## Moment
+    for moment_position, moment_magnitude in moments:
+        if moment_magnitude > 0:
+            imagebox = icon_box(icons["moment_clockwise"])
+            ab = AnnotationBbox(imagebox, (moment_position, 0.0), frameon=False)
+            ax.add_artist(ab)
+
+            ax.text(moment_position, 0.3, f'{abs(moment_magnitude)} kNm', color='black', ha='center')
+
+        elif moment_magnitude < 0:
+            imagebox = icon_box(icons["moment_anticlockwise"])
+            ab = AnnotationBbox(imagebox, (moment_position, 0), frameon=False)
+            ax.add_artist(ab)
+
+            ax.text(moment_position, 0.3, f'{abs(moment_magnitude)} kNm', color='black', ha='center')
+
+    return fig
+
+
+def plot_shear(solution):
+    x, shear = decimate(*with_extrema(solution.x, solution.shear, solution.min_shear, solution.max_shear))
+    fig, ax = _subplots(figsize=(12,4))
+    ax.plot(x, shear, color ="blue")
+    ax.fill_between(x, shear, 0, color="blue", alpha=0.3)
+    ax.axhline(0, color="black", linewidth=0.8, linestyle="--")
+    ax.set_title("Shear Force Diagram")
+    ax.set_xlabel("Beam Length (m)")
+    ax.set_ylabel("Shear Force (kN)")
+    return fig
+
+
+def plot_moment(solution):
+    x, moment = decimate(*with_extrema(solution.x, solution.moment, solution.min_moment, solution.max_moment))
+    fig, ax = _subplots(figsize=(12,4))
+    ax.plot(x, moment, color ="green")
+    ax.fill_between(x, moment, 0, color="green", alpha=0.3)
+    ax.axhline(0, color="black", linewidth=0.8, linestyle="--")
+    ax.set_title("Bending Force Diagram")
+    ax.set_xlabel("Beam Length (m)")
+    ax.set_ylabel("Bending Moment (kNm)")
+    return fig
+
+
+def plot_deflection(solution):
+    x, slope = decimate(solution.x, solution.slope)
+    x_deflection, deflection = decimate(*with_extrema(solution.x, solution.deflection, solution.min_deflection, solution.max_deflection))
+    fig, (ax_slope, ax_deflection) = _subplots(2, 1, figsize=(12, 7), sharex=True)
+    ax_slope.plot(x, slope, color="purple")
+    ax_slope.fill_between(x, slope, 0, color="purple", alpha=0.3)
+    ax_slope.axhline(0, color="black", linewidth=0.8, linestyle="--")
+    ax_slope.set_title("Slope and Deflection Diagrams")
+    ax_slope.set_ylabel("Slope (rad)")
+    ax_deflection.plot(x_deflection, deflection * 1000, color="red")
+    ax_deflection.fill_between(x_deflection, deflection * 1000, 0, color="red", alpha=0.3)
+    ax_deflection.axhline(0, color="black", linewidth=0.8, linestyle="--")
+    ax_deflection.set_xlabel("Beam Length (m)")
+    ax_deflection.set_ylabel("Deflection (mm)")
+    return fig
+
+
+def plot_envelope(envelope, kind):
+    if kind == "shear":
+        upper, lower, color, title, label = envelope.shear_max, envelope.shear_min, "blue", "Shear Force Envelope", "Shear Force (kN)"
+    else:
+        upper, lower, color, title, label = envelope.moment_max, envelope.moment_min, "green", "Bending Moment Envelope", "Bending Moment (kNm)"
+    x, upper, lower = decimate(envelope.x, upper, lower)
+    fig, ax = _subplots(figsize=(12,4))
+    ax.plot(x, upper, color=color)
+    ax.plot(x, lower, color=color, linestyle=":")
+    ax.fill_between(x, upper, lower, color=color, alpha=0.3)
+    ax.axhline(0, color="black", linewidth=0.8, linestyle="--")
+    ax.set_title(title)
+    ax.set_xlabel("Beam Length (m)")
+    ax.set_ylabel(label)
+    return fig
+
+
+def plot_moving_load(result):
+    fig, (ax_shear, ax_moment) = _subplots(2, 1, figsize=(12, 7), sharex=True)
+    for ax, upper, lower, color, label in (
+        (ax_shear, result.shear_max, result.shear_min, "blue", "Shear Force (kN)"),
+        (ax_moment, result.moment_max, result.moment_min, "green", "Bending Moment (kNm)"),
+    ):
+        x, upper, lower = decimate(result.x, upper, lower)
+        ax.plot(x, upper, color=color)
+        ax.plot(x, lower, color=color, linestyle=":")
+        ax.fill_between(x, upper, lower, color=color, alpha=0.3)
+        ax.axhline(0, color="black", linewidth=0.8, linestyle="--")
+        ax.set_ylabel(label)
+    ax_shear.set_title("Moving Load Envelope")
+    ax_moment.set_xlabel("Beam Length (m)")
+    return fig
@@ -0,0 +1,32 @@
+"""Random load cases shared by the solver tests."""
+import numpy as np
+
+from beamcalc import normalize_distributed_loads
+
+
+def random_case(rng, layout, beam_length=10.0):
+    # (supports, point_loads, distributed_loads, moments) on a beam of beam_length. Loads are
+    # kept at least 0.1 m apart from each other's nodes so the stiffness method stays well
+    # conditioned; some linear loads have a zero resultant, and some are entered right to
+    # left and normalized as the page and parse_beam do.
+    if layout == "fixed left":
+        supports = [("Fixed", 0.0)]
+    elif layout == "fixed right":
+        supports = [("Fixed", beam_length)]
+    elif layout == "simple":
+        supports = [("Hinge", float(rng.integers(0, 4))), ("Roller", float(rng.integers(6, 11)))]
+    else:
+        supports = [("Fixed", 0.0), ("Roller", 5.0), ("Hinge", beam_length)]
+    grid = rng.permutation(np.arange(1, 10 * beam_length) / 10)
+    point_loads = [(float(grid[i]), float(rng.normal(0, 5))) for i in range(rng.integers(1, 4))]
+    distributed_loads = []
+    for i in range(rng.integers(0, 3)):
+        start_pos, end_pos = sorted(grid[10 + 2 * i:12 + 2 * i])
+        start_mag = float(rng.normal(0, 3))
+        end_mag = -start_mag if rng.random() < 0.3 else float(rng.normal(0, 3))
+        if rng.random() < 0.3:
+            distributed_loads.append((float(end_pos), float(start_pos), end_mag, start_mag))
+        else:
+            distributed_loads.append((float(start_pos), float(end_pos), start_mag, end_mag))
+    moments = [(float(grid[20 + i]), float(rng.normal(0, 10))) for i in range(rng.integers(0, 3))]
+    return supports, point_loads, normalize_distributed_loads(distributed_loads), moments
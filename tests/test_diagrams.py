@@ -0,0 +1,147 @@
+import numpy as np
+import pytest
+
+from beamcalc import ContributionCache, bending_moment, exact_diagrams, shear_force, solve_beam, solve_reactions
+
+from cases import random_case
+
+
+def loop_shear_force(support_reactions, point_loads, distributed_loads, beam_length, resolution):
+    # the original per-point loops the vectorized grid engine replaced
+    x_coords = np.linspace(0, beam_length, int(beam_length * resolution) + 1)
+    shear = [0.0] * len(x_coords)
+    for position, magnitude in list(support_reactions) + list(point_loads):
+        for i, x in enumerate(x_coords):
+            if x >= position:
+                shear[i] += magnitude
+    for start_pos, end_pos, start_mag, end_mag in distributed_loads:
+        for x in x_coords:
+            if start_pos <= x <= end_pos:
+                increment = (start_mag + (end_mag - start_mag) * ((x - start_pos) / (end_pos - start_pos))) * (x_coords[1] - x_coords[0])
+                for j, y in enumerate(x_coords):
+                    if y >= x:
+                        shear[j] += increment
+    return x_coords, np.array(shear)
+
+
+def loop_bending_moment(supports, support_reactions, support_moments, point_loads, distributed_loads, external_moments, beam_length, resolution):
+    x_coords = np.linspace(0, beam_length, int(beam_length * resolution) + 1)
+    moment = [0.0] * len(x_coords)
+    for position, magnitude in list(support_reactions) + list(point_loads):
+        for i, x in enumerate(x_coords):
+            if x >= position:
+                moment[i] += magnitude * (x - position)
+    couples = list(external_moments) + [(position, magnitude if position == 0 else -magnitude) for position, magnitude in support_moments]
+    for position, magnitude in couples:
+        for i, x in enumerate(x_coords):
+            if x >= position:
+                moment[i] += magnitude
+    for start_pos, end_pos, start_mag, end_mag in distributed_loads:
+        for x in x_coords:
+            if start_pos <= x <= end_pos:
+                increment = (start_mag + (end_mag - start_mag) * ((x - start_pos) / (end_pos - start_pos))) * (x_coords[1] - x_coords[0])
+                for j, y in enumerate(x_coords):
+                    if y >= x:
+                        moment[j] += (y - x) * increment
+    return x_coords, np.array(moment)
+
+
+@pytest.mark.parametrize("layout", ["fixed left", "simple", "continuous"])
+def test_grid_engine_matches_loops(layout):
+    rng = np.random.default_rng(3)
+    for trial in range(5):
+        supports, point_loads, distributed_loads, moments = random_case(rng, layout)
+        support_reactions, support_moments = solve_reactions(supports, point_loads, distributed_loads, moments, 10.0)
+        x_coords, shear = shear_force(support_reactions, point_loads, distributed_loads, 10.0, 20)
+        assert shear == pytest.approx(loop_shear_force(support_reactions, point_loads, distributed_loads, 10.0, 20)[1], abs=1e-9)
+        args = (supports, support_reactions, support_moments, point_loads, distributed_loads, moments, 10.0, 20)
+        assert bending_moment(*args)[1] == pytest.approx(loop_bending_moment(*args)[1], abs=1e-9)
+
+
+@pytest.mark.parametrize("layout", ["fixed left", "fixed right", "simple", "continuous"])
+def test_exact_diagrams_close(layout):
+    # with correct reactions the shear and moment come back to zero past the right end
+    rng = np.random.default_rng(5)
+    for trial in range(20):
+        supports, point_loads, distributed_loads, moments = random_case(rng, layout)
+        support_reactions, support_moments = solve_reactions(supports, point_loads, distributed_loads, moments, 10.0)
+        shear_poly, moment_poly = exact_diagrams(supports, support_reactions, support_moments, point_loads, distributed_loads, moments, 10.0)
+        assert shear_poly(np.array([10.0]))[0] == pytest.approx(0.0, abs=1e-6)
+        assert moment_poly(np.array([10.0]))[0] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_exact_matches_grid_at_concentrated_loads():
+    # without distributed loads the grid engine is exact at its grid points
+    supports, point_loads, moments = [("Hinge", 0.0), ("Roller", 10.0)], [(2.5, -4.0), (7.0, 3.0)], [(5.0, 6.0)]
+    support_reactions, support_moments = solve_reactions(supports, point_loads, [], moments, 10.0)
+    shear_poly, moment_poly = exact_diagrams(supports, support_reactions, support_moments, point_loads, [], moments, 10.0)
+    x_coords, shear = shear_force(support_reactions, point_loads, [], 10.0, 10)
+    assert shear_poly(x_coords) == pytest.approx(shear, abs=1e-9)
+    assert moment_poly(x_coords) == pytest.approx(bending_moment(supports, support_reactions, support_moments, point_loads, [], moments, 10.0, 10)[1], abs=1e-9)
+
+
+def test_simply_supported_peak_moment():
+    solution = solve_beam([("Hinge", 0.0), ("Roller", 10.0)], [(5.0, -10.0)], [], [], 10.0, 400)
+    assert solution.max_moment == pytest.approx((5.0, 25.0))
+
+
+def test_fixed_fixed_midspan_deflection():
+    # wL^4 / 384EI
+    solution = solve_beam([("Fixed", 0.0), ("Fixed", 10.0)], [], [(0.0, 10.0, -2.0, -2.0)], [], 10.0, 400, 1000.0)
+    assert solution.min_deflection == pytest.approx((5.0, -2.0 * 10.0**4 / 384 / 1000.0))
+
+
+def test_cantilever_deflection_sampled_between_breakpoints():
+    # a tip load leaves shear and moment straight; the cubic P x^2 (3L - x) / 6EI still gets samples
+    solution = solve_beam([("Fixed", 0.0)], [(10.0, -10.0)], [], [], 10.0, 201, 1000.0)
+    inside = (solution.x > 0.0) & (solution.x < 10.0)
+    assert inside.sum() > 100
+    x = solution.x[inside]
+    assert solution.deflection[inside] == pytest.approx(-10.0 * x**2 * (30.0 - x) / 6 / 1000.0)
+
+
+def test_deflection_sampled_in_unloaded_span():
+    # the load in the first span lifts the second; its peak must show in the sampled curve
+    solution = solve_beam([("Hinge", 0.0), ("Roller", 5.0), ("Roller", 10.0)], [(2.5, -10.0)], [], [], 10.0, 201, 1000.0)
+    position, peak = solution.max_deflection
+    assert 5.0 < position < 10.0 and peak > 0.0
+    span = (solution.x > 5.0) & (solution.x < 10.0)
+    assert solution.deflection[span].max() == pytest.approx(peak, rel=1e-3)
+
+def solve_with(contributions, supports, point_loads, distributed_loads, moments):
+    support_reactions, support_moments = solve_reactions(supports, point_loads, distributed_loads, moments, 10.0)
+    return exact_diagrams(supports, support_reactions, support_moments, point_loads, distributed_loads, moments, 10.0, contributions)
+
+
+def assert_same(polys, expected):
+    x_coords = np.linspace(0, 10.0, 257)
+    for poly, reference in zip(polys, expected):
+        assert poly(x_coords) == pytest.approx(reference(x_coords), abs=1e-9)
+
+
+def test_contribution_cache_matches_full_build():
+    rng = np.random.default_rng(7)
+    contributions = ContributionCache()
+    for trial in range(20):
+        case = random_case(rng, "continuous")
+        assert_same(solve_with(contributions, *case), solve_with(None, *case))
+
+
+def test_contribution_cache_reuses_unchanged_loads():
+    supports = [("Hinge", 0.0), ("Roller", 10.0)]
+    point_loads, distributed_loads, moments = [(2.0, -4.0), (6.0, -3.0)], [(1.0, 9.0, -1.0, -2.0)], [(5.0, 2.0)]
+    contributions = ContributionCache()
+    solve_with(contributions, supports, point_loads, distributed_loads, moments)
+    before = contributions.stats()
+
+    # a new magnitude keeps the breakpoints: only that load and the two reactions are rebuilt
+    edited = [(2.0, -5.0), (6.0, -3.0)]
+    assert_same(solve_with(contributions, supports, edited, distributed_loads, moments), solve_with(None, supports, edited, distributed_loads, moments))
+    after = contributions.stats()
+    assert after["computed"] - before["computed"] == 3
+    assert after["reused"] - before["reused"] == 3
+
+    # a new position moves the breakpoints, so everything is rebuilt, and still matches
+    moved = [(2.5, -5.0), (6.0, -3.0)]
+    assert_same(solve_with(contributions, supports, moved, distributed_loads, moments), solve_with(None, supports, moved, distributed_loads, moments))
+    assert contributions.stats()["size"] == 6
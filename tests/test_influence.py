@@ -0,0 +1,32 @@
+import pytest
+
+from beamcalc import moving_load
+
+# the page's default axle train: (load in kN, distance behind the front axle in m)
+AXLES = [(35.0, 0.0), (145.0, 4.3), (145.0, 8.6)]
+
+
+def test_single_load_on_simple_span():
+    # PL/4 at midspan, and the whole load as shear next to either support
+    result = moving_load([("Hinge", 0.0), ("Roller", 10.0)], 10.0, [100.0], [0.0])
+    assert result.max_moment[:2] == pytest.approx((250.0, 5.0))
+    assert abs(result.max_shear[0]) == pytest.approx(100.0)
+    assert result.shear_max[0] == pytest.approx(100.0)
+    assert result.shear_min[-1] == pytest.approx(-100.0)
+
+
+@pytest.mark.parametrize("fixed_pos", [0.0, 10.0])
+def test_single_load_on_cantilever(fixed_pos):
+    # -PL at the fixed end, with the load at the free end
+    result = moving_load([("Fixed", fixed_pos)], 10.0, [100.0], [0.0])
+    assert result.max_moment[:2] == pytest.approx((-1000.0, fixed_pos))
+    assert abs(result.max_shear[0]) == pytest.approx(100.0)
+
+
+def test_axle_train_critical_sections_are_at_the_supports():
+    loads, offsets = [load for load, offset in AXLES], [offset for load, offset in AXLES]
+    cantilever = moving_load([("Fixed", 10.0)], 10.0, loads, offsets)
+    # rear axle over the support, the other two at 4.3 and 8.6 m from it
+    assert cantilever.max_moment[:2] == pytest.approx((-(145 * 10 + 145 * 5.7 + 35 * 1.4), 10.0))
+    simple = moving_load([("Hinge", 0.0), ("Roller", 10.0)], 10.0, loads, offsets)
+    assert abs(simple.max_shear[0]) == pytest.approx(max(value for value, front in simple.max_reactions))
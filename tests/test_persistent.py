@@ -0,0 +1,34 @@
+import sqlite3
+
+import pytest
+
+from beamcalc import PersistentCache, SolverCache, cached_solve
+
+CASE = ([("Hinge", 0.0), ("Roller", 10.0)], [(4.0, -10.0)], [(0.0, 10.0, -1.0, -2.0)], [], 10.0, 400, 1000.0)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "solutions.sqlite")
+
+
+def test_warm_start_from_disk(path):
+    expected = cached_solve(SolverCache(8, PersistentCache(path)), *CASE)
+    cache = SolverCache(8, PersistentCache(path))
+    solution = cached_solve(cache, *CASE)
+    assert cache.backing.stats()["hits"] == 1
+    assert solution.reactions == expected.reactions
+    assert solution.deflection == pytest.approx(expected.deflection)
+
+
+def test_corrupt_entry_is_a_miss(path):
+    expected = cached_solve(SolverCache(8, PersistentCache(path)), *CASE)
+    with sqlite3.connect(path) as connection:
+        connection.execute("UPDATE solutions SET value = X'0500000000'")
+    cache = SolverCache(8, PersistentCache(path))
+    assert cached_solve(cache, *CASE).reactions == expected.reactions
+    assert cache.backing.stats()["errors"] == 1
+    # the bad row was replaced by the fresh solution
+    cache = SolverCache(8, PersistentCache(path))
+    cached_solve(cache, *CASE)
+    assert cache.backing.stats()["hits"] == 1
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from beamcalc import normalize_distributed_loads, solve_reactions, solve_stiffness
+from beamcalc.batch import solve_batch
+from beamcalc.reactions import calculate_reactions
+
+from cases import random_case
+
+
+def values(reactions):
+    support_reactions, support_moments = reactions
+    return np.array([magnitude for position, magnitude in list(support_reactions) + list(support_moments)], dtype=float)
+
+
+UDL = [(0.0, 10.0, -2.0, -2.0)]  # w = 2 kN/m down over L = 10 m
+
+
+def test_propped_cantilever():
+    # R = 3wL/8 at the prop, 5wL/8 and wL^2/8 at the fixed end
+    reactions = solve_reactions([("Fixed", 0.0), ("Roller", 10.0)], [], UDL, [], 10.0)
+    assert values(reactions) == pytest.approx([12.5, 7.5, -25.0])
+
+
+def test_fixed_fixed():
+    # wL/2 and wL^2/12 at both ends
+    reactions = solve_reactions([("Fixed", 0.0), ("Fixed", 10.0)], [], UDL, [], 10.0)
+    assert values(reactions) == pytest.approx([10.0, 10.0, -100 / 6, -100 / 6])
+
+
+def test_two_equal_spans():
+    # 0.375wL at the ends and 1.25wL in the middle
+    reactions = solve_reactions([("Hinge", 0.0), ("Roller", 10.0), ("Roller", 20.0)], [], [(0.0, 20.0, -2.0, -2.0)], [], 20.0)
+    assert values(reactions) == pytest.approx([7.5, 25.0, 7.5])
+
+
+def test_simply_supported_point_load():
+    reactions = solve_reactions([("Hinge", 0.0), ("Roller", 10.0)], [(4.0, -10.0)], [], [], 10.0)
+    assert values(reactions) == pytest.approx([6.0, 4.0])
+
+
+@pytest.mark.parametrize("fixed_pos, expected", [(0.0, -10.0), (10.0, 10.0)])
+def test_cantilever_couple(fixed_pos, expected):
+    # the determinate formula and the stiffness method agree on the sign of the support moment
+    reactions = solve_reactions([("Fixed", fixed_pos)], [], [], [(5.0, 10.0)], 10.0)
+    assert values(reactions) == pytest.approx([0.0, expected], abs=1e-9)
+    assert values(solve_stiffness([("Fixed", fixed_pos)], [], [], [(5.0, 10.0)], 10.0)) == pytest.approx([0.0, expected], abs=1e-9)
+
+
+def test_cantilever_zero_resultant_load():
+    # a linear load from -2 to +2 kN/m has no resultant but still a moment of 33.3 kNm
+    reactions = calculate_reactions([("Fixed", 0.0)], [], [(0.0, 10.0, -2.0, 2.0)], [], 10.0)
+    assert [magnitude for position, magnitude in reactions] == pytest.approx([0.0, 100 / 3])
+
+
+def test_mechanism_is_unsolvable():
+    assert solve_stiffness([("Roller", 5.0)], [(2.0, -1.0)], [], [], 10.0) is None
+
+
+@pytest.mark.parametrize("layout", ["fixed left", "fixed right", "simple"])
+def test_determinate_batch_and_stiffness_agree(layout):
+    rng = np.random.default_rng(11)
+    for trial in range(50):
+        supports, point_loads, distributed_loads, moments = random_case(rng, layout)
+        expected = values(solve_stiffness(supports, point_loads, distributed_loads, moments, 10.0))
+        assert values(solve_reactions(supports, point_loads, distributed_loads, moments, 10.0)) == pytest.approx(expected, rel=1e-6, abs=1e-6)
+        batch = solve_batch(supports, 10.0, [point_loads], [distributed_loads] if distributed_loads else None, [moments] if moments else None)
+        assert np.concatenate([batch[1][0], batch[2][0]]) == pytest.approx(expected, rel=1e-6, abs=1e-6)
+
+
+def test_short_element_is_not_a_mechanism():
+    # a load 3 mm from another node used to fail the pivot check
+    reactions = solve_stiffness([("Fixed", 0.0)], [(0.2, 3.0)], [(0.203, 1.65, 3.0, 7.7)], [], 10.0)
+    assert reactions is not None
+    assert values(reactions)[0] == pytest.approx(-3.0 - 0.5 * (3.0 + 7.7) * 1.447)
+
+
+def test_reversed_distributed_load():
+    # (8, 2, -1, -1) is the same 6 kN load as (2, 8, -1, -1) once normalized, in every engine
+    supports = [("Hinge", 0.0), ("Roller", 10.0)]
+    distributed_loads = normalize_distributed_loads([(8.0, 2.0, -1.0, -1.0)])
+    assert distributed_loads == [(2.0, 8.0, -1.0, -1.0)]
+    assert values(solve_reactions(supports, [], distributed_loads, [], 10.0)) == pytest.approx([3.0, 3.0])
+    assert values(solve_stiffness(supports, [], distributed_loads, [], 10.0)) == pytest.approx([3.0, 3.0])
+    assert solve_batch(supports, 10.0, distributed_loads=[distributed_loads])[1][0] == pytest.approx([3.0, 3.0])
@@ -0,0 +1,117 @@
+import http.client
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from beamcalc import server
+from beamcalc.batch import solve_batch
+from beamcalc.bulk import parse_beam
+from beamcalc.worker import solve_line
+
+BEAM = {"length": 10, "supports": [["Hinge", 0], ["Roller", 10]], "distributed_loads": [[0, 10, -1, -3]]}
+
+
+@pytest.fixture(scope="module")
+def service():
+    return server.SolverService()
+
+
+@pytest.mark.parametrize("points", [20000000, -1, "many"])
+def test_out_of_range_points_are_rejected(service, points):
+    with pytest.raises(ValueError, match="points"):
+        service.solve({**BEAM, "points": points})
+    with pytest.raises(ValueError, match="points"):
+        service.diagrams({**BEAM, "points": points})
+    assert json.loads(solve_line(json.dumps({**BEAM, "points": points})))["status"].startswith("error: points")
+
+
+def test_too_many_loads_are_rejected(service):
+    model = {**BEAM, "point_loads": [[1, -1]] * (server.MAX_LOADS + 1)}
+    with pytest.raises(ValueError, match="loads"):
+        service.solve(model)
+    with pytest.raises(ValueError, match="loads"):
+        service.diagrams(model)
+
+
+@pytest.mark.parametrize("change, column", [
+    ({"length": float("nan")}, "length"),
+    ({"length": 0}, "length"),
+    ({"length": "-5"}, "length"),
+    ({"supports": [["Hinge", 0], ["Roller", 12]]}, "supports"),
+    ({"supports": [["Hinge", float("inf")], ["Roller", 10]]}, "supports"),
+    ({"point_loads": [[-1, -5]]}, "point_loads"),
+    ({"point_loads": [[5, float("nan")]]}, "point_loads"),
+    ({"distributed_loads": [[0, 11, -1, -1]]}, "distributed_loads"),
+    ({"moments": [[5, float("-inf")]]}, "moments"),
+    ({"flexural_rigidity": float("inf")}, "flexural_rigidity"),
+])
+def test_invalid_models_name_the_column(service, change, column):
+    model = {**BEAM, **change}
+    with pytest.raises(ValueError, match=column):
+        parse_beam(model)
+    with pytest.raises(ValueError, match=column):
+        service.solve(model)
+    assert json.loads(solve_line(json.dumps(model)))["status"].startswith(f"error: {column}")
+
+
+def test_chunked_diagram_group_matches_one_batch(monkeypatch):
+    rng = np.random.default_rng(0)
+    supports = [("Hinge", 0.0), ("Roller", 10.0)]
+    cases = [([(float(p), -1.0) for p in rng.uniform(0, 10, rng.integers(1, 30))], [(1.0, 8.0, -1.0, -2.0)], [(5.0, 3.0)]) for _ in range(12)]
+    monkeypatch.setattr(server, "ELEMENT_BUDGET", 3000)
+    results = server.solve_diagram_group(supports, 10.0, 501, cases)
+    for (point_loads, distributed_loads, moments), result in zip(cases, results):
+        x_coords, reactions, support_moments, shear, moment = solve_batch(supports, 10.0, [point_loads], [distributed_loads], [moments], x_coords=np.linspace(0, 10, 501))
+        assert result["reactions"] == pytest.approx(reactions[0])
+        assert result["shear"] == pytest.approx(shear[0], abs=1e-9)
+        assert result["moment"] == pytest.approx(moment[0], abs=1e-9)
+
+
+def test_solve_and_diagrams_agree_on_fixed_end_couple(service):
+    # the determinate path and the batch path give the same support moment
+    model = {"length": 10, "supports": [["Fixed", 10]], "moments": [[5, 10]], "points": 11}
+    assert service.solve(model)["support_moments"] == pytest.approx([10.0])
+    assert service.diagrams(model)["support_moments"] == pytest.approx([10.0])
+
+
+def test_worker_reports_non_finite_results():
+    # two loads near the float limit overflow the reactions; the line must stay strict JSON
+    model = {**BEAM, "id": "big", "point_loads": [[5, -1e308], [6, -1e308]], "distributed_loads": []}
+    with np.errstate(over="ignore"):
+        line = solve_line(json.dumps(model))
+    assert json.loads(line, parse_constant=pytest.fail) == {"id": "big", "status": "error: result is not finite"}
+
+
+@pytest.fixture()
+def address():
+    httpd = server.make_server(port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def post(address, body, length=None):
+    connection = http.client.HTTPConnection(*address, timeout=5)
+    connection.putrequest("POST", "/v1/solve")
+    connection.putheader("Content-Length", str(len(body) if length is None else length))
+    connection.endheaders(body)
+    response = connection.getresponse()
+    return response.status, json.loads(response.read(), parse_constant=pytest.fail)
+
+
+def test_negative_content_length_is_rejected(address):
+    status, body = post(address, b"{}", length=-1)
+    assert status == 400 and "Content-Length" in body["status"]
+
+
+@pytest.mark.filterwarnings("ignore:overflow:RuntimeWarning")  # raised in the server's thread
+def test_non_finite_models_and_results_are_rejected(address):
+    status, body = post(address, json.dumps({**BEAM, "length": float("nan")}).encode())
+    assert status == 400 and body["status"].startswith("error: length")
+    model = {**BEAM, "point_loads": [[5, -1e308], [6, -1e308]], "distributed_loads": []}
+    status, body = post(address, json.dumps(model).encode())
+    assert status == 400 and body["status"] == "error: result is not finite"